@@ -322,10 +322,11 @@ async def start_server():
 
     # Wait for callback with timeout
     timeout = 300  # 5 minutes
-    start_time = asyncio.get_event_loop().time()
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
 
     while access_token is None:
-        if asyncio.get_event_loop().time() - start_time > timeout:
+        if loop.time() - start_time > timeout:
             logger.error(
                 "Authentication timeout - no callback received within 5 minutes"
             )
@@ -3,12 +3,12 @@
 Pydantic models for Wahoo API data structures
 """
 
-import json
 from datetime import datetime
-from enum import Enum
+from enum import Enum, StrEnum
+from functools import cached_property
 from typing import Any, TypedDict
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class WahooTarget(TypedDict):
@@ -59,7 +59,7 @@ class WahooPlan(TypedDict):
     intervals: list[WahooInterval]
 
 
-class WorkoutTypeLocation(Enum):
+class WorkoutTypeLocation(StrEnum):
     """Workout type locations"""
 
     OUTDOOR = "Outdoor"
@@ -67,7 +67,7 @@ class WorkoutTypeLocation(Enum):
     UNKNOWN = "Unknown"
 
 
-class WorkoutTypeFamily(Enum):
+class WorkoutTypeFamily(StrEnum):
     """Workout type families"""
 
     BIKING = "Biking"
@@ -382,19 +382,24 @@ class WorkoutType(Enum):
         self.description = description
         self.location = location
         self.family = family
+        # Precomputed once per member for the workout list display
+        self.display = f"{description} ({location}, {family})"
 
     @classmethod
     def from_id(cls, workout_type_id: int) -> "WorkoutType":
         """Get WorkoutType from ID, returns UNKNOWN if not found"""
-        for workout_type in cls:
-            if workout_type.id == workout_type_id:
-                return workout_type
-        return cls.UNKNOWN
+        return _WORKOUT_TYPES_BY_ID.get(workout_type_id, cls.UNKNOWN)
 
     def __str__(self) -> str:
         return self.description
 
 
+# Lookup table for WorkoutType.from_id, built once at import time
+_WORKOUT_TYPES_BY_ID: dict[int, WorkoutType] = {
+    workout_type.id: workout_type for workout_type in WorkoutType
+}
+
+
 class RouteFile(BaseModel):
     """Route file information"""
 
@@ -432,33 +437,34 @@ class Route(BaseModel):
 
         return "\n".join(lines)
 
-    def format_details(self) -> str:
+    def format_details(self, verbose: bool = False) -> str:
         """Format route for detailed display"""
-        details = f"""Route Details (ID: {self.id}):
-- Name: {self.name}"""
+        lines = [f"Route Details (ID: {self.id}):", f"- Name: {self.name}"]
 
         if self.description:
-            details += f"\n- Description: {self.description}"
+            lines.append(f"- Description: {self.description}")
 
-        details += f"""
-- User ID: {self.user_id}
-- Workout Type Family ID: {self.workout_type_family_id}"""
+        lines.append(f"- User ID: {self.user_id}")
+        lines.append(f"- Workout Type Family ID: {self.workout_type_family_id}")
 
         if self.external_id:
-            details += f"\n- External ID: {self.external_id}"
+            lines.append(f"- External ID: {self.external_id}")
         if self.start_lat and self.start_lng:
-            details += f"\n- Start Position: {self.start_lat:.6f}, {self.start_lng:.6f}"
+            lines.append(
+                f"- Start Position: {self.start_lat:.6f}, {self.start_lng:.6f}"
+            )
         if self.distance:
-            details += f"\n- Distance: {self.distance:.1f}"
+            lines.append(f"- Distance: {self.distance:.1f}")
         if self.ascent:
-            details += f"\n- Ascent: {self.ascent:.1f}"
+            lines.append(f"- Ascent: {self.ascent:.1f}")
         if self.descent:
-            details += f"\n- Descent: {self.descent:.1f}"
+            lines.append(f"- Descent: {self.descent:.1f}")
 
-        details += f"\n- File URL: {self.file.url}"
-        details += f"\n\nFull JSON:\n{json.dumps(self.model_dump(), indent=2)}"
+        lines.append(f"- File URL: {self.file.url}")
+        if verbose:
+            lines.append(f"\nFull JSON:\n{self.model_dump_json(indent=2)}")
 
-        return details
+        return "\n".join(lines)
 
 
 class PlanFile(BaseModel):
@@ -494,31 +500,27 @@ class Plan(BaseModel):
         lines.append(f"  Deleted: {self.deleted}")
         return "\n".join(lines)
 
-    def format_details(self) -> str:
+    def format_details(self, verbose: bool = False) -> str:
         """Format plan for detailed display"""
-        details = f"""Plan Details (ID: {self.id}):
-- Name: {self.name}"""
+        lines = [f"Plan Details (ID: {self.id}):", f"- Name: {self.name}"]
 
         if self.description:
-            details += f"\n- Description: {self.description}"
+            lines.append(f"- Description: {self.description}")
 
-        details += f"""
-- User ID: {self.user_id}
-- Workout Type Family ID: {self.workout_type_family_id}"""
+        lines.append(f"- User ID: {self.user_id}")
+        lines.append(f"- Workout Type Family ID: {self.workout_type_family_id}")
 
         if self.external_id:
-            details += f"\n- External ID: {self.external_id}"
+            lines.append(f"- External ID: {self.external_id}")
         if self.provider_updated_at:
-            details += f"\n- Provider Updated: {self.provider_updated_at}"
+            lines.append(f"- Provider Updated: {self.provider_updated_at}")
 
-        details += f"""
-- Deleted: {self.deleted}
-- File URL: {self.file.url}
+        lines.append(f"- Deleted: {self.deleted}")
+        lines.append(f"- File URL: {self.file.url}")
+        if verbose:
+            lines.append(f"\nFull JSON:\n{self.model_dump_json(indent=2)}")
 
-Full JSON:
-{json.dumps(self.model_dump(), indent=2)}"""
-
-        return details
+        return "\n".join(lines)
 
 
 class WorkoutTarget(BaseModel):
@@ -756,13 +758,14 @@ class PowerZone(BaseModel):
     created_at: str = Field(description="Creation timestamp in ISO 8601 format")
     updated_at: str = Field(description="Last update timestamp in ISO 8601 format")
 
-    def get_workout_type(self) -> WorkoutType:
-        """Get the WorkoutType enum for this power zone"""
+    @cached_property
+    def workout_type(self) -> WorkoutType:
+        """The WorkoutType enum for this power zone"""
         return WorkoutType.from_id(self.workout_type_id)
 
     def format_summary(self) -> str:
         """Format power zone for list display"""
-        workout_type = self.get_workout_type()
+        workout_type = self.workout_type
         lines = [
             f"- ID: {self.id}",
             f"  FTP: {self.ftp}W",
@@ -778,38 +781,58 @@ class PowerZone(BaseModel):
 
         return "\n".join(lines)
 
-    def format_details(self) -> str:
+    def format_details(self, verbose: bool = False) -> str:
         """Format power zone for detailed display"""
-        workout_type = self.get_workout_type()
-        details = f"""Power Zone Details (ID: {self.id}):
-- User ID: {self.user_id}
-- FTP: {self.ftp}W
-- Zone Count: {self.zone_count}
-- Workout Type: {workout_type.description}
-- Zone 1: {self.zone_1}W
-- Zone 2: {self.zone_2}W
-- Zone 3: {self.zone_3}W
-- Zone 4: {self.zone_4}W
-- Zone 5: {self.zone_5}W
-- Zone 6: {self.zone_6}W
-- Zone 7: {self.zone_7}W"""
+        workout_type = self.workout_type
+        lines = [
+            f"Power Zone Details (ID: {self.id}):",
+            f"- User ID: {self.user_id}",
+            f"- FTP: {self.ftp}W",
+            f"- Zone Count: {self.zone_count}",
+            f"- Workout Type: {workout_type.description}",
+            f"- Zone 1: {self.zone_1}W",
+            f"- Zone 2: {self.zone_2}W",
+            f"- Zone 3: {self.zone_3}W",
+            f"- Zone 4: {self.zone_4}W",
+            f"- Zone 5: {self.zone_5}W",
+            f"- Zone 6: {self.zone_6}W",
+            f"- Zone 7: {self.zone_7}W",
+        ]
 
         if self.critical_power:
-            details += f"\n- Critical Power: {self.critical_power}W"
+            lines.append(f"- Critical Power: {self.critical_power}W")
+
+        lines.append(f"- Created: {self.created_at}")
+        lines.append(f"- Updated: {self.updated_at}")
+        if verbose:
+            lines.append(f"\nFull JSON:\n{self.model_dump_json(indent=2)}")
+
+        return "\n".join(lines)
+
 
-        details += f"""
-- Created: {self.created_at}
-- Updated: {self.updated_at}
+def _format_duration(minutes: int) -> str:
+    """Format a duration in minutes as a readable string"""
+    if minutes < 60:  # noqa: PLR2004
+        return f"{minutes} minutes"
+    hours = minutes // 60  # noqa: PLR2004
+    remaining_minutes = minutes % 60  # noqa: PLR2004
+    if remaining_minutes == 0:
+        return f"{hours} hour{'s' if hours != 1 else ''}"
+    return f"{hours}h {remaining_minutes}m"
 
-Full JSON:
-{json.dumps(self.model_dump(), indent=2)}"""
 
-        return details
+# Preformatted durations for workouts up to three hours, which covers most
+_DURATION_STRINGS: tuple[str, ...] = tuple(
+    _format_duration(minutes) for minutes in range(181)
+)
 
 
 class Workout(BaseModel):
     """Wahoo workout model matching the Cloud API schema"""
 
+    # Workouts are read-only API data; drop unknown fields the API may add
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     id: int = Field(description="Unique workout identifier")
     starts: str = Field(description="Workout start time in ISO 8601 format")
     minutes: int = Field(description="Workout duration in minutes")
@@ -818,50 +841,41 @@ class Workout(BaseModel):
     route_id: int | None = Field(None, description="Associated route ID")
     workout_token: str = Field(description="Application-specific identifier")
     workout_type_id: int = Field(description="Type of workout")
-    workout_summary: dict[str, Any] | None = Field(
-        None, description="Workout results/summary data"
-    )
+    # Only checked for presence, so skip validating its contents
+    workout_summary: Any = Field(None, description="Workout results/summary data")
     created_at: str = Field(description="Creation timestamp in ISO 8601 format")
     updated_at: str = Field(description="Last update timestamp in ISO 8601 format")
 
     def duration_str(self) -> str:
         """Format duration as a readable string"""
-        if self.minutes < 60:  # noqa: PLR2004
-            return f"{self.minutes} minutes"
-        hours = self.minutes // 60  # noqa: PLR2004
-        remaining_minutes = self.minutes % 60  # noqa: PLR2004
-        if remaining_minutes == 0:
-            return f"{hours} hour{'s' if hours != 1 else ''}"
-        return f"{hours}h {remaining_minutes}m"
+        if 0 <= self.minutes < len(_DURATION_STRINGS):
+            return _DURATION_STRINGS[self.minutes]
+        return _format_duration(self.minutes)
 
+    @cached_property
     def formatted_start_time(self) -> str:
-        """Format start time for display"""
+        """Start time formatted for display"""
         try:
-            dt = datetime.fromisoformat(self.starts.replace("Z", "+00:00"))
+            # fromisoformat accepts the trailing "Z" UTC designator natively
+            dt = datetime.fromisoformat(self.starts)
             return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
-        except Exception:
+        except ValueError:
             return self.starts
 
-    def get_workout_type(self) -> WorkoutType:
-        """Get the WorkoutType enum for this workout"""
+    @cached_property
+    def workout_type(self) -> WorkoutType:
+        """The WorkoutType enum for this workout"""
         return WorkoutType.from_id(self.workout_type_id)
 
-    def workout_type_description(self) -> str:
-        """Get the human-readable workout type description"""
-        return str(self.get_workout_type())
-
     def format_summary(self) -> str:
         """Format workout for list display"""
-        workout_type = self.get_workout_type()
+        workout_type = self.workout_type
         lines = [
             f"- ID: {self.id}",
             f"  Name: {self.name}",
-            f"  Date: {self.formatted_start_time()}",
+            f"  Date: {self.formatted_start_time}",
             f"  Duration: {self.duration_str()}",
-            (
-                f"  Type: {workout_type.description} "
-                f"({workout_type.location.value}, {workout_type.family.value})"
-            ),
+            f"  Type: {workout_type.display}",
         ]
 
         if self.plan_id:
@@ -871,29 +885,38 @@ class Workout(BaseModel):
 
         return "\n".join(lines)
 
-    def format_details(self) -> str:
+    def format_details(self, verbose: bool = False) -> str:
         """Format workout for detailed display"""
-        workout_type = self.get_workout_type()
-        details = f"""Workout Details (ID: {self.id}):
-- Name: {self.name}
-- Start Time: {self.formatted_start_time()}
-- Duration: {self.duration_str()}
-- Type: {workout_type.description}
-- Location: {workout_type.location.value}
-- Family: {workout_type.family.value}
-- Workout Token: {self.workout_token}"""
+        workout_type = self.workout_type
+        lines = [
+            f"Workout Details (ID: {self.id}):",
+            f"- Name: {self.name}",
+            f"- Start Time: {self.formatted_start_time}",
+            f"- Duration: {self.duration_str()}",
+            f"- Type: {workout_type.description}",
+            f"- Location: {workout_type.location}",
+            f"- Family: {workout_type.family}",
+            f"- Workout Token: {self.workout_token}",
+        ]
 
         if self.plan_id:
-            details += f"\n- Plan ID: {self.plan_id}"
+            lines.append(f"- Plan ID: {self.plan_id}")
         if self.route_id:
-            details += f"\n- Route ID: {self.route_id}"
+            lines.append(f"- Route ID: {self.route_id}")
+
+        lines.append(f"- Created: {self.created_at}")
+        lines.append(f"- Updated: {self.updated_at}")
+        lines.append(f"- Has Summary: {'Yes' if self.workout_summary else 'No'}")
+        if verbose:
+            lines.append(f"\nFull JSON:\n{self.model_dump_json(indent=2)}")
+
+        return "\n".join(lines)
+
 
-        details += f"""
-- Created: {self.created_at}
-- Updated: {self.updated_at}
-- Has Summary: {"Yes" if self.workout_summary else "No"}
+class WorkoutPage(BaseModel):
+    """A page of workouts as returned by the workouts list endpoint"""
 
-Full JSON:
-{json.dumps(self.model_dump(), indent=2)}"""
+    model_config = ConfigDict(extra="ignore")
 
-        return details
+    workouts: list[Workout] = Field(default_factory=list)
+    total: int | None = None
@@ -1,18 +1,24 @@
 #!/usr/bin/env python3
+import asyncio
 import base64
-import json
 import logging
+import math
 import os
+import time
+from dataclasses import dataclass
 from http import HTTPStatus
+from itertools import chain
 from pathlib import Path
 from typing import Any
+from urllib.parse import quote
 
 import httpx
+import orjson
 from dotenv import load_dotenv
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
-from pydantic import BaseModel, Field
+from pydantic import ValidationError
 
 from .models import (
     CreatePlanRequest,
@@ -22,49 +28,94 @@ from .models import (
     Route,
     Workout,
     WorkoutInterval,
+    WorkoutPage,
     WorkoutPlan,
     WorkoutTarget,
 )
 from .token_store import TokenStore
 
+try:
+    import uvloop
+except ImportError:  # Optional dependency, unavailable on Windows
+    uvloop = None
+
 # Type aliases for cleaner function signatures
 ToolResponse = list[TextContent]
 Arguments = dict[str, Any]
 
+# Largest page size requested when fetching every workout
+MAX_WORKOUTS_PER_PAGE = 200
+# Maximum number of API requests in flight at once for batched fetches
+MAX_CONCURRENT_REQUESTS = 5
+# Refresh access tokens this many seconds before they expire
+TOKEN_EXPIRY_BUFFER_SECONDS = 300
+# Longest slice of an error response body returned to the MCP client
+MAX_ERROR_BODY_LENGTH = 512
+
 # Load environment variables
 load_dotenv()
 
+# Read configuration once at import time rather than on every client/refresh
+TOKEN_FILE = os.getenv("WAHOO_TOKEN_FILE")
+CLIENT_ID = os.getenv("WAHOO_CLIENT_ID")
+CLIENT_SECRET = os.getenv("WAHOO_CLIENT_SECRET")
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
-class WahooConfig(BaseModel):
-    base_url: str = Field(
-        default="https://api.wahooligan.com", description="Base URL for Wahoo API"
-    )
+@dataclass(slots=True, frozen=True)
+class WahooConfig:
+    """Static configuration for the Wahoo API client"""
+
+    base_url: str = "https://api.wahooligan.com"
 
 
 class WahooAPIClient:
-    def __init__(self, config: WahooConfig):
+    def __init__(
+        self, config: WahooConfig, http_client: httpx.AsyncClient | None = None
+    ):
         self.config = config
-        token_file = os.getenv("WAHOO_TOKEN_FILE")
-        if not token_file:
+        if not TOKEN_FILE:
             raise ValueError("WAHOO_TOKEN_FILE environment variable is required")
-        self.token_store = TokenStore(token_file)
+        self.token_store = TokenStore(TOKEN_FILE)
         self.token_data = self.token_store.get_current()
         if not self.token_data:
-            raise ValueError(f"No valid tokens found in {token_file}")
-        self.client = httpx.AsyncClient(
-            base_url=config.base_url,
-            headers=self._get_headers(),
+            raise ValueError(f"No valid tokens found in {TOKEN_FILE}")
+        # Last tokens read from the store, to spot when another process (e.g.
+        # `make auth`) rewrites the token file
+        self._stored_token = self.token_data
+        self._update_token_deadline()
+        # Serializes refreshes so a burst of 401s only spends the refresh token once
+        self._refresh_lock = asyncio.Lock()
+        # Only close the connection pool in aclose() if we created it here
+        self._owns_client = http_client is None
+        if http_client is None:
+            self.client = httpx.AsyncClient(
+                headers={"Content-Type": "application/json"},
+                # Tool calls arrive sporadically; keep idle connections warm for
+                # longer than httpx's 5s default so they skip a TLS handshake
+                limits=httpx.Limits(
+                    max_keepalive_connections=20,
+                    max_connections=100,
+                    keepalive_expiry=60,
+                ),
+                http2=True,
+            )
+        else:
+            # Borrow the caller's connection pool without changing its settings;
+            # requests use absolute URLs and carry their own bearer token
+            self.client = http_client
+
+    def _update_token_deadline(self) -> None:
+        """Cache when the current token needs refreshing on the monotonic clock"""
+        if not self.token_data.expires_at:
+            self._token_valid_until = math.inf
+            return
+        remaining = (
+            self.token_data.expires_at - time.time() - TOKEN_EXPIRY_BUFFER_SECONDS
         )
-
-    def _get_headers(self) -> dict[str, str]:
-        """Get current headers with valid access token"""
-        return {
-            "Authorization": f"Bearer {self.token_data.access_token}",
-            "Content-Type": "application/json",
-        }
+        self._token_valid_until = time.monotonic() + remaining
 
     async def _refresh_access_token(self) -> bool:
         """Refresh the access token using refresh token"""
@@ -72,25 +123,23 @@ class WahooAPIClient:
             logger.error("No refresh token available")
             return False
 
-        client_id = os.getenv("WAHOO_CLIENT_ID")
-        if not client_id:
+        if not CLIENT_ID:
             logger.error("WAHOO_CLIENT_ID not set, cannot refresh token")
             return False
 
         try:
             # Prepare refresh token request
             data = {
-                "client_id": client_id,
+                "client_id": CLIENT_ID,
                 "grant_type": "refresh_token",
                 "refresh_token": self.token_data.refresh_token,
             }
 
             # Check if we should use client_secret (confidential client) or
             # code_verifier (public client)
-            client_secret = os.getenv("WAHOO_CLIENT_SECRET")
-            if client_secret:
+            if CLIENT_SECRET:
                 # Confidential client: use client_secret
-                data["client_secret"] = client_secret
+                data["client_secret"] = CLIENT_SECRET
                 logger.info(
                     "Using client_secret for token refresh (confidential client)"
                 )
@@ -105,146 +154,258 @@ class WahooAPIClient:
                     "No client_secret or code_verifier available for token refresh"
                 )
 
-            async with httpx.AsyncClient() as refresh_client:
-                response = await refresh_client.post(
-                    f"{self.config.base_url}/oauth/token",
-                    data=data,
-                )
+            # Reuse the pooled API connection; the token endpoint takes a form
+            # body and no bearer token
+            response = await self.client.post(
+                f"{self.config.base_url}/oauth/token",
+                data=data,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
 
-                if response.status_code == HTTPStatus.OK:
-                    token_response = response.json()
-                    self.token_data = self.token_store.update_from_response(
-                        token_response
-                    )
-                    # Update client headers with new token
-                    self.client.headers.update(self._get_headers())
-                    logger.info("Successfully refreshed access token")
-                    return True
-                else:
-                    logger.error(
-                        f"Failed to refresh token: {response.status_code} - "
-                        f"{response.text}"
-                    )
-                    return False
+            if response.status_code == HTTPStatus.OK:
+                token_response = orjson.loads(response.content)
+                self.token_data = self.token_store.update_from_response(token_response)
+                self._update_token_deadline()
+                logger.info("Successfully refreshed access token")
+                return True
+            else:
+                logger.error(
+                    f"Failed to refresh token: {response.status_code} - {response.text}"
+                )
+                return False
 
         except Exception as e:
             logger.error(f"Error refreshing token: {e}")
             return False
 
+    def _reload_token(self) -> None:
+        """Adopt tokens another process (e.g. `make auth`) wrote to the token file"""
+        stored = self.token_store.load()
+        if stored is None or stored is self._stored_token:
+            return
+        self._stored_token = stored
+        if stored != self.token_data:
+            logger.info("Token file changed, using the tokens stored there")
+            self.token_data = stored
+            self._update_token_deadline()
+
+    async def _refresh_access_token_once(self, stale_access_token: str) -> bool:
+        """Refresh the access token unless it was already replaced.
+
+        A concurrent caller may have refreshed it, or another process may have
+        written new tokens to the file, possibly rotating the refresh token.
+        """
+        async with self._refresh_lock:
+            self._reload_token()
+            if self.token_data.access_token != stale_access_token:
+                return True
+            return await self._refresh_access_token()
+
     async def _ensure_valid_token(self) -> bool:
         """Ensure we have a valid access token, refreshing if necessary"""
         if not self.token_data:
             return False
 
-        if self.token_data.is_expired():
+        # Fast path: skip the wall-clock expiry check while the token is fresh
+        if time.monotonic() < self._token_valid_until:
+            return True
+
+        if self.token_data.is_expired(buffer_seconds=TOKEN_EXPIRY_BUFFER_SECONDS):
             logger.info("Access token expired, attempting to refresh")
-            return await self._refresh_access_token()
+            return await self._refresh_access_token_once(self.token_data.access_token)
 
         return True
 
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
-
-    async def list_workouts(
+    async def _send(
         self,
-        page: int = 1,
-        per_page: int = 30,
-        start_date: str | None = None,
-        end_date: str | None = None,
-    ) -> list[Workout]:
-        await self._ensure_valid_token()
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a single API request with the current bearer token"""
+        headers = {
+            "Authorization": f"Bearer {self.token_data.access_token}",
+            **(headers or {}),
+        }
+        return await self.client.request(
+            method, f"{self.config.base_url}{url}", headers=headers, **kwargs
+        )
 
-        params = {"page": page, "per_page": per_page}
-        if start_date:
-            params["created_after"] = start_date
-        if end_date:
-            params["created_before"] = end_date
+    async def _request_with_retry(
+        self, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        """Send an API request, refreshing the token and retrying once on 401"""
+        await self._ensure_valid_token()
 
-        response = await self.client.get("/v1/workouts", params=params)
+        access_token = self.token_data.access_token
+        response = await self._send(method, url, **kwargs)
 
         # Handle 401 by refreshing token and retrying once
         if response.status_code == HTTPStatus.UNAUTHORIZED:
             logger.info("Got 401 Unauthorized, attempting to refresh token")
-            if await self._refresh_access_token():
-                response = await self.client.get("/v1/workouts", params=params)
-            else:
+            if not await self._refresh_access_token_once(access_token):
                 raise httpx.HTTPStatusError(
                     "Authentication failed and token refresh was unsuccessful",
                     request=response.request,
                     response=response,
                 )
+            response = await self._send(method, url, **kwargs)
 
         response.raise_for_status()
-        data = response.json()
-        workouts_data = data.get("workouts", [])
+        return response
 
-        # Convert each workout dict to Workout object
-        workouts = []
-        for workout_dict in workouts_data:
-            try:
-                workout = Workout(**workout_dict)
-                workouts.append(workout)
-            except Exception as e:
-                logger.warning(
-                    f"Failed to parse workout {workout_dict.get('id', 'unknown')}: {e}"
-                )
-                # Continue with other workouts instead of failing completely
-                continue
+    async def _request_json(self, method: str, url: str, **kwargs: Any) -> Any:
+        """Send an API request and decode its JSON body.
 
-        return workouts
+        Only the decoded data is returned so the response and its raw body
+        can be released before the payload is turned into models.
+        """
+        response = await self._request_with_retry(method, url, **kwargs)
+        return orjson.loads(response.content)
 
-    async def get_workout(self, workout_id: int) -> Workout:
-        await self._ensure_valid_token()
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool if this client created it"""
+        if self._owns_client:
+            await self.client.aclose()
 
-        response = await self.client.get(f"/v1/workouts/{workout_id}")
+    async def __aenter__(self):
+        return self
 
-        # Handle 401 by refreshing token and retrying once
-        if response.status_code == HTTPStatus.UNAUTHORIZED:
-            logger.info("Got 401 Unauthorized, attempting to refresh token")
-            if await self._refresh_access_token():
-                response = await self.client.get(f"/v1/workouts/{workout_id}")
-            else:
-                raise httpx.HTTPStatusError(
-                    "Authentication failed and token refresh was unsuccessful",
-                    request=response.request,
-                    response=response,
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def _list_workouts_page(
+        self,
+        page: int,
+        per_page: int,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> tuple[list[Workout], int | None]:
+        """Fetch a single page of workouts along with the reported total count"""
+        # Build the query string directly rather than encoding a params dict
+        url = f"/v1/workouts?page={page}&per_page={per_page}"
+        if start_date:
+            url += f"&created_after={quote(start_date, safe='')}"
+        if end_date:
+            url += f"&created_before={quote(end_date, safe='')}"
+
+        response = await self._request_with_retry("GET", url)
+
+        try:
+            # Parse and validate the whole page in a single pydantic-core pass
+            workout_page = WorkoutPage.model_validate_json(response.content)
+            return workout_page.workouts, workout_page.total
+        except ValidationError:
+            data = orjson.loads(response.content)
+            workouts_data = data.get("workouts", [])
+
+            # Convert each workout dict to Workout object
+            workouts = []
+            for workout_dict in workouts_data:
+                try:
+                    workout = Workout.model_validate(workout_dict)
+                    workouts.append(workout)
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to parse workout "
+                        f"{workout_dict.get('id', 'unknown')}: {e}"
+                    )
+                    # Continue with other workouts instead of failing completely
+                    continue
+
+        return workouts, data.get("total")
+
+    async def list_workouts(
+        self,
+        page: int = 1,
+        per_page: int = 30,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> list[Workout]:
+        workouts, _ = await self._list_workouts_page(
+            page, per_page, start_date, end_date
+        )
+        return workouts
+
+    async def list_all_workouts(
+        self,
+        per_page: int = MAX_WORKOUTS_PER_PAGE,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> list[Workout]:
+        """List every workout, fetching the remaining pages concurrently"""
+        workouts, total = await self._list_workouts_page(
+            1, per_page, start_date, end_date
+        )
+        if total is None:
+            # Without a total to plan from, walk pages until one comes back short
+            page_workouts = workouts
+            page = 1
+            while len(page_workouts) == per_page:
+                page += 1
+                page_workouts, _ = await self._list_workouts_page(
+                    page, per_page, start_date, end_date
+                )
+                workouts.extend(page_workouts)
+            return workouts
+        if total <= per_page:
+            return workouts
+
+        # Bound the fan-out to avoid tripping the API rate limits
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def fetch_page(page: int) -> list[Workout]:
+            async with semaphore:
+                page_workouts, _ = await self._list_workouts_page(
+                    page, per_page, start_date, end_date
                 )
+                return page_workouts
 
-        response.raise_for_status()
-        workout_dict = response.json()
+        last_page = math.ceil(total / per_page)
+        pages = await asyncio.gather(
+            *(fetch_page(page) for page in range(2, last_page + 1))
+        )
+        return list(chain(workouts, *pages))
+
+    async def get_workout(self, workout_id: int) -> Workout:
+        response = await self._request_with_retry("GET", f"/v1/workouts/{workout_id}")
 
         try:
-            return Workout(**workout_dict)
+            return Workout.model_validate_json(response.content)
         except Exception as e:
             logger.error(f"Failed to parse workout {workout_id}: {e}")
             raise ValueError(f"Invalid workout data received from API: {e}") from e
 
-    async def list_routes(self, external_id: str | None = None) -> list[Route]:
-        await self._ensure_valid_token()
+    async def get_workouts(
+        self, workout_ids: list[int]
+    ) -> list[Workout | BaseException]:
+        """Get several workouts, fetching them concurrently.
+
+        A failed fetch is returned in its place as the exception it raised, so
+        one bad ID doesn't throw away the workouts that were fetched.
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def fetch_workout(workout_id: int) -> Workout:
+            async with semaphore:
+                return await self.get_workout(workout_id)
+
+        # Fetch each distinct workout once, then return them in request order
+        unique_ids = list(dict.fromkeys(workout_ids))
+        fetched = await asyncio.gather(
+            *(fetch_workout(workout_id) for workout_id in unique_ids),
+            return_exceptions=True,
+        )
+        workouts_by_id = dict(zip(unique_ids, fetched, strict=True))
+        return [workouts_by_id[workout_id] for workout_id in workout_ids]
 
+    async def list_routes(self, external_id: str | None = None) -> list[Route]:
         params = {}
         if external_id:
             params["external_id"] = external_id
 
-        response = await self.client.get("/v1/routes", params=params)
-
-        # Handle 401 by refreshing token and retrying once
-        if response.status_code == HTTPStatus.UNAUTHORIZED:
-            logger.info("Got 401 Unauthorized, attempting to refresh token")
-            if await self._refresh_access_token():
-                response = await self.client.get("/v1/routes", params=params)
-            else:
-                raise httpx.HTTPStatusError(
-                    "Authentication failed and token refresh was unsuccessful",
-                    request=response.request,
-                    response=response,
-                )
-
-        response.raise_for_status()
-        data = response.json()
+        data = await self._request_json("GET", "/v1/routes", params=params)
         # Handle both dict and list response formats
         if isinstance(data, dict):
             routes_data = data.get("routes", [])
@@ -257,7 +418,7 @@ class WahooAPIClient:
         routes = []
         for route_dict in routes_data:
             try:
-                route = Route(**route_dict)
+                route = Route.model_validate(route_dict)
                 routes.append(route)
             except Exception as e:
                 logger.warning(
@@ -269,54 +430,20 @@ class WahooAPIClient:
         return routes
 
     async def get_route(self, route_id: int) -> Route:
-        await self._ensure_valid_token()
-
-        response = await self.client.get(f"/v1/routes/{route_id}")
-
-        # Handle 401 by refreshing token and retrying once
-        if response.status_code == HTTPStatus.UNAUTHORIZED:
-            logger.info("Got 401 Unauthorized, attempting to refresh token")
-            if await self._refresh_access_token():
-                response = await self.client.get(f"/v1/routes/{route_id}")
-            else:
-                raise httpx.HTTPStatusError(
-                    "Authentication failed and token refresh was unsuccessful",
-                    request=response.request,
-                    response=response,
-                )
-
-        response.raise_for_status()
-        route_dict = response.json()
+        response = await self._request_with_retry("GET", f"/v1/routes/{route_id}")
 
         try:
-            return Route(**route_dict)
+            return Route.model_validate_json(response.content)
         except Exception as e:
             logger.error(f"Failed to parse route {route_id}: {e}")
             raise ValueError(f"Invalid route data received from API: {e}") from e
 
     async def list_plans(self, external_id: str | None = None) -> list[Plan]:
-        await self._ensure_valid_token()
-
         params = {}
         if external_id:
             params["external_id"] = external_id
 
-        response = await self.client.get("/v1/plans", params=params)
-
-        # Handle 401 by refreshing token and retrying once
-        if response.status_code == HTTPStatus.UNAUTHORIZED:
-            logger.info("Got 401 Unauthorized, attempting to refresh token")
-            if await self._refresh_access_token():
-                response = await self.client.get("/v1/plans", params=params)
-            else:
-                raise httpx.HTTPStatusError(
-                    "Authentication failed and token refresh was unsuccessful",
-                    request=response.request,
-                    response=response,
-                )
-
-        response.raise_for_status()
-        data = response.json()
+        data = await self._request_json("GET", "/v1/plans", params=params)
         # Handle both dict and list response formats
         if isinstance(data, dict):
             plans_data = data.get("plans", [])
@@ -329,7 +456,7 @@ class WahooAPIClient:
         plans = []
         for plan_dict in plans_data:
             try:
-                plan = Plan(**plan_dict)
+                plan = Plan.model_validate(plan_dict)
                 plans.append(plan)
             except Exception as e:
                 logger.warning(
@@ -341,41 +468,21 @@ class WahooAPIClient:
         return plans
 
     async def get_plan(self, plan_id: int) -> Plan:
-        await self._ensure_valid_token()
-
-        response = await self.client.get(f"/v1/plans/{plan_id}")
-
-        # Handle 401 by refreshing token and retrying once
-        if response.status_code == HTTPStatus.UNAUTHORIZED:
-            logger.info("Got 401 Unauthorized, attempting to refresh token")
-            if await self._refresh_access_token():
-                response = await self.client.get(f"/v1/plans/{plan_id}")
-            else:
-                raise httpx.HTTPStatusError(
-                    "Authentication failed and token refresh was unsuccessful",
-                    request=response.request,
-                    response=response,
-                )
-
-        response.raise_for_status()
-        plan_dict = response.json()
+        response = await self._request_with_retry("GET", f"/v1/plans/{plan_id}")
 
         try:
-            return Plan(**plan_dict)
+            return Plan.model_validate_json(response.content)
         except Exception as e:
             logger.error(f"Failed to parse plan {plan_id}: {e}")
             raise ValueError(f"Invalid plan data received from API: {e}") from e
 
     async def create_plan(self, plan_request: CreatePlanRequest) -> CreatePlanResponse:
         """Create a new plan in the user's library"""
-        await self._ensure_valid_token()
-
         # Convert structured plan data to Wahoo plan JSON format
         plan_json = plan_request.plan.to_wahoo_format()
 
-        # Encode as base64
-        plan_json_str = json.dumps(plan_json, separators=(",", ":"))
-        plan_base64 = base64.b64encode(plan_json_str.encode("utf-8")).decode("utf-8")
+        # Encode as base64 (orjson emits compact UTF-8 bytes)
+        plan_base64 = base64.b64encode(orjson.dumps(plan_json)).decode("utf-8")
 
         # Prepare form data for the API call
         form_data = {
@@ -387,62 +494,20 @@ class WahooAPIClient:
         if plan_request.filename:
             form_data["plan[filename]"] = plan_request.filename
 
-        response = await self.client.post(
-            "/v1/plans",
-            data=form_data,
-            headers={
-                "Authorization": f"Bearer {self.token_data.access_token}",
-                "Content-Type": "application/x-www-form-urlencoded",
-            },
+        # _send adds the Authorization header on top of these
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        response = await self._request_with_retry(
+            "POST", "/v1/plans", data=form_data, headers=headers
         )
 
-        # Handle 401 by refreshing token and retrying once
-        if response.status_code == HTTPStatus.UNAUTHORIZED:
-            logger.info("Got 401 Unauthorized, attempting to refresh token")
-            if await self._refresh_access_token():
-                response = await self.client.post(
-                    "/v1/plans",
-                    data=form_data,
-                    headers={
-                        "Authorization": f"Bearer {self.token_data.access_token}",
-                        "Content-Type": "application/x-www-form-urlencoded",
-                    },
-                )
-            else:
-                raise httpx.HTTPStatusError(
-                    "Authentication failed and token refresh was unsuccessful",
-                    request=response.request,
-                    response=response,
-                )
-
-        response.raise_for_status()
-        plan_dict = response.json()
-
         try:
-            return CreatePlanResponse(**plan_dict)
+            return CreatePlanResponse.model_validate_json(response.content)
         except Exception as e:
             logger.error(f"Failed to parse created plan: {e}")
             raise ValueError(f"Invalid plan data received from API: {e}") from e
 
     async def list_power_zones(self) -> list[PowerZone]:
-        await self._ensure_valid_token()
-
-        response = await self.client.get("/v1/power_zones")
-
-        # Handle 401 by refreshing token and retrying once
-        if response.status_code == HTTPStatus.UNAUTHORIZED:
-            logger.info("Got 401 Unauthorized, attempting to refresh token")
-            if await self._refresh_access_token():
-                response = await self.client.get("/v1/power_zones")
-            else:
-                raise httpx.HTTPStatusError(
-                    "Authentication failed and token refresh was unsuccessful",
-                    request=response.request,
-                    response=response,
-                )
-
-        response.raise_for_status()
-        data = response.json()
+        data = await self._request_json("GET", "/v1/power_zones")
         # Handle both dict and list response formats
         if isinstance(data, dict):
             power_zones_data = data.get("power_zones", [])
@@ -455,7 +520,7 @@ class WahooAPIClient:
         power_zones = []
         for power_zone_dict in power_zones_data:
             try:
-                power_zone = PowerZone(**power_zone_dict)
+                power_zone = PowerZone.model_validate(power_zone_dict)
                 power_zones.append(power_zone)
             except Exception as e:
                 logger.warning(
@@ -468,101 +533,104 @@ class WahooAPIClient:
         return power_zones
 
     async def get_power_zone(self, power_zone_id: int) -> PowerZone:
-        await self._ensure_valid_token()
-
-        response = await self.client.get(f"/v1/power_zones/{power_zone_id}")
-
-        # Handle 401 by refreshing token and retrying once
-        if response.status_code == HTTPStatus.UNAUTHORIZED:
-            logger.info("Got 401 Unauthorized, attempting to refresh token")
-            if await self._refresh_access_token():
-                response = await self.client.get(f"/v1/power_zones/{power_zone_id}")
-            else:
-                raise httpx.HTTPStatusError(
-                    "Authentication failed and token refresh was unsuccessful",
-                    request=response.request,
-                    response=response,
-                )
-
-        response.raise_for_status()
-        power_zone_dict = response.json()
+        response = await self._request_with_retry(
+            "GET", f"/v1/power_zones/{power_zone_id}"
+        )
 
         try:
-            return PowerZone(**power_zone_dict)
+            return PowerZone.model_validate_json(response.content)
         except Exception as e:
             logger.error(f"Failed to parse power zone {power_zone_id}: {e}")
             raise ValueError(f"Invalid power zone data received from API: {e}") from e
 
 
+# Tool input schemas shipped alongside this module
+SCHEMAS_DIR = Path(__file__).parent / "schemas"
+
+
 def load_json_schema(schema: str) -> dict:
     """Load a JSON schema from a file."""
-    return json.loads((Path("src/schemas") / schema).read_text())
+    return orjson.loads((SCHEMAS_DIR / schema).read_bytes())
 
 
 app = Server("wahoo-mcp")
 
+# Tool definitions are static, so build them once at import time
+TOOLS: list[Tool] = [
+    Tool(
+        name="list_workouts",
+        description="List workouts from Wahoo Cloud API",
+        inputSchema=load_json_schema("list_workouts.json"),
+    ),
+    Tool(
+        name="get_workout",
+        description="Get detailed information about a specific workout",
+        inputSchema=load_json_schema("get_workout.json"),
+    ),
+    Tool(
+        name="get_workouts",
+        description="Get detailed information about several workouts at once",
+        inputSchema=load_json_schema("get_workouts.json"),
+    ),
+    Tool(
+        name="list_routes",
+        description="List routes from Wahoo Cloud API",
+        inputSchema=load_json_schema("list_routes.json"),
+    ),
+    Tool(
+        name="get_route",
+        description="Get detailed information about a specific route",
+        inputSchema=load_json_schema("get_route.json"),
+    ),
+    Tool(
+        name="list_plans",
+        description="List plans from Wahoo Cloud API",
+        inputSchema=load_json_schema("list_plans.json"),
+    ),
+    Tool(
+        name="get_plan",
+        description="Get detailed information about a specific plan",
+        inputSchema=load_json_schema("get_plan.json"),
+    ),
+    Tool(
+        name="create_plan",
+        description="Create a new plan in the user's library",
+        inputSchema=load_json_schema("create_plan.json"),
+    ),
+    Tool(
+        name="list_power_zones",
+        description="List power zones from Wahoo Cloud API",
+        inputSchema=load_json_schema("list_power_zones.json"),
+    ),
+    Tool(
+        name="get_power_zone",
+        description="Get detailed information about a specific power zone",
+        inputSchema=load_json_schema("get_power_zone.json"),
+    ),
+]
+
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
-    return [
-        Tool(
-            name="list_workouts",
-            description="List workouts from Wahoo Cloud API",
-            inputSchema=load_json_schema("list_workouts.json"),
-        ),
-        Tool(
-            name="get_workout",
-            description="Get detailed information about a specific workout",
-            inputSchema=load_json_schema("get_workout.json"),
-        ),
-        Tool(
-            name="list_routes",
-            description="List routes from Wahoo Cloud API",
-            inputSchema=load_json_schema("list_routes.json"),
-        ),
-        Tool(
-            name="get_route",
-            description="Get detailed information about a specific route",
-            inputSchema=load_json_schema("get_route.json"),
-        ),
-        Tool(
-            name="list_plans",
-            description="List plans from Wahoo Cloud API",
-            inputSchema=load_json_schema("list_plans.json"),
-        ),
-        Tool(
-            name="get_plan",
-            description="Get detailed information about a specific plan",
-            inputSchema=load_json_schema("get_plan.json"),
-        ),
-        Tool(
-            name="create_plan",
-            description="Create a new plan in the user's library",
-            inputSchema=load_json_schema("create_plan.json"),
-        ),
-        Tool(
-            name="list_power_zones",
-            description="List power zones from Wahoo Cloud API",
-            inputSchema=load_json_schema("list_power_zones.json"),
-        ),
-        Tool(
-            name="get_power_zone",
-            description="Get detailed information about a specific power zone",
-            inputSchema=load_json_schema("get_power_zone.json"),
-        ),
-    ]
+    return TOOLS
 
 
 async def _handle_list_workouts(
     client: WahooAPIClient, arguments: Arguments
 ) -> ToolResponse:
     """Handle list_workouts tool request."""
-    workouts = await client.list_workouts(
-        page=arguments.get("page", 1),
-        per_page=arguments.get("per_page", 30),
-        start_date=arguments.get("start_date"),
-        end_date=arguments.get("end_date"),
-    )
+    if arguments.get("all"):
+        workouts = await client.list_all_workouts(
+            start_date=arguments.get("start_date"),
+            end_date=arguments.get("end_date"),
+        )
+    else:
+        workouts = await client.list_workouts(
+            page=arguments.get("page", 1),
+            per_page=arguments.get("per_page", 30),
+            start_date=arguments.get("start_date"),
+            end_date=arguments.get("end_date"),
+        )
 
     if not workouts:
         return [TextContent(type="text", text="No workouts found.")]
@@ -578,7 +646,41 @@ async def _handle_get_workout(
     """Handle get_workout tool request."""
     workout_id = arguments["workout_id"]
     workout = await client.get_workout(workout_id)
-    return [TextContent(type="text", text=workout.format_details())]
+    details = workout.format_details(verbose=arguments.get("verbose", False))
+    return [TextContent(type="text", text=details)]
+
+
+async def _handle_get_workouts(
+    client: WahooAPIClient, arguments: Arguments
+) -> ToolResponse:
+    """Handle get_workouts tool request."""
+    workout_ids = arguments["workout_ids"]
+    workouts = await client.get_workouts(workout_ids)
+
+    if not workouts:
+        return [TextContent(type="text", text="No workouts found.")]
+
+    verbose = arguments.get("verbose", False)
+    result = "\n\n".join(
+        _format_workout_result(workout_id, workout, verbose)
+        for workout_id, workout in zip(workout_ids, workouts, strict=True)
+    )
+    return [TextContent(type="text", text=result)]
+
+
+def _format_workout_result(
+    workout_id: int, workout: Workout | BaseException, verbose: bool
+) -> str:
+    """Format a fetched workout, or a short error line if fetching it failed."""
+    if isinstance(workout, httpx.HTTPStatusError):
+        response = workout.response
+        return (
+            f"Workout {workout_id}: HTTP Error {response.status_code} "
+            f"{response.reason_phrase}"
+        )
+    if isinstance(workout, BaseException):
+        return f"Workout {workout_id}: Error: {type(workout).__name__}: {workout}"
+    return workout.format_details(verbose=verbose)
 
 
 async def _handle_list_routes(
@@ -601,7 +703,8 @@ async def _handle_get_route(
     """Handle get_route tool request."""
     route_id = arguments["route_id"]
     route = await client.get_route(route_id)
-    return [TextContent(type="text", text=route.format_details())]
+    details = route.format_details(verbose=arguments.get("verbose", False))
+    return [TextContent(type="text", text=details)]
 
 
 async def _handle_list_plans(
@@ -624,7 +727,8 @@ async def _handle_get_plan(
     """Handle get_plan tool request."""
     plan_id = arguments["plan_id"]
     plan = await client.get_plan(plan_id)
-    return [TextContent(type="text", text=plan.format_details())]
+    details = plan.format_details(verbose=arguments.get("verbose", False))
+    return [TextContent(type="text", text=details)]
 
 
 def _build_workout_intervals(intervals_data: list) -> list[WorkoutInterval]:
@@ -647,21 +751,23 @@ def _build_workout_intervals(intervals_data: list) -> list[WorkoutInterval]:
 
 def _format_plan_result(created_plan) -> str:
     """Format the plan creation result message."""
-    result = f"""Plan created successfully!
-
-Plan Details:
-- ID: {created_plan.id}
-- Name: {created_plan.name}
-- External ID: {created_plan.external_id}
-- User ID: {created_plan.user_id}
-- Created: {created_plan.created_at}
-- Updated: {created_plan.updated_at}
-- File URL: {created_plan.file.url}"""
+    lines = [
+        "Plan created successfully!",
+        "",
+        "Plan Details:",
+        f"- ID: {created_plan.id}",
+        f"- Name: {created_plan.name}",
+        f"- External ID: {created_plan.external_id}",
+        f"- User ID: {created_plan.user_id}",
+        f"- Created: {created_plan.created_at}",
+        f"- Updated: {created_plan.updated_at}",
+        f"- File URL: {created_plan.file.url}",
+    ]
 
     if created_plan.description:
-        result += f"\n- Description: {created_plan.description}"
+        lines.append(f"- Description: {created_plan.description}")
 
-    return result
+    return "\n".join(lines)
 
 
 async def _handle_create_plan(
@@ -717,13 +823,15 @@ async def _handle_get_power_zone(
     """Handle get_power_zone tool request."""
     power_zone_id = arguments["power_zone_id"]
     power_zone = await client.get_power_zone(power_zone_id)
-    return [TextContent(type="text", text=power_zone.format_details())]
+    details = power_zone.format_details(verbose=arguments.get("verbose", False))
+    return [TextContent(type="text", text=details)]
 
 
 # Tool handler mapping
 TOOL_HANDLERS = {
     "list_workouts": _handle_list_workouts,
     "get_workout": _handle_get_workout,
+    "get_workouts": _handle_get_workouts,
     "list_routes": _handle_list_routes,
     "get_route": _handle_get_route,
     "list_plans": _handle_list_plans,
@@ -734,36 +842,67 @@ TOOL_HANDLERS = {
 }
 
 
+def _format_http_error(response: httpx.Response) -> str:
+    """Format an HTTP error response without echoing the full body."""
+    message = f"HTTP Error {response.status_code} {response.reason_phrase}"
+
+    if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            return f"{message}: rate limited, retry after {retry_after} seconds"
+        return f"{message}: rate limited, retry later"
+
+    body = (response.text or "")[:MAX_ERROR_BODY_LENGTH]
+    return f"{message}: {body}" if body else message
+
+
+# Shared API client, reused across tool calls to keep connections alive
+_client: WahooAPIClient | None = None
+
+
+def _get_client() -> WahooAPIClient:
+    """Get the shared API client, creating it on first use."""
+    global _client  # noqa: PLW0603
+    if _client is None:
+        _client = WahooAPIClient(WahooConfig())
+    return _client
+
+
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Main tool dispatcher."""
-    config = WahooConfig()
-
     # Check if tool exists
     if name not in TOOL_HANDLERS:
         return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
     try:
-        async with WahooAPIClient(config) as client:
-            handler = TOOL_HANDLERS[name]
-            return await handler(client, arguments)
+        client = _get_client()
+        handler = TOOL_HANDLERS[name]
+        return await handler(client, arguments)
     except httpx.HTTPStatusError as e:
-        return [
-            TextContent(
-                type="text",
-                text=f"HTTP Error {e.response.status_code}: {e.response.text}",
-            )
-        ]
+        return [TextContent(type="text", text=_format_http_error(e.response))]
     except Exception as e:
-        return [TextContent(type="text", text=f"Error: {str(e)}")]
+        logger.exception(f"Error handling tool {name}")
+        return [TextContent(type="text", text=f"Error: {type(e).__name__}: {e}")]
 
 
 async def main():
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(read_stream, write_stream, app.create_initialization_options())
+    # Surface missing configuration once at startup; tool calls still report
+    # the error individually so the client sees it too
+    if not TOKEN_FILE:
+        logger.warning("WAHOO_TOKEN_FILE is not set; API tools will fail")
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream, write_stream, app.create_initialization_options()
+            )
+    finally:
+        if _client is not None:
+            await _client.aclose()
 
 
 if __name__ == "__main__":
-    import asyncio
-
-    asyncio.run(main())
+    # Prefer uvloop's libuv-backed event loop when it is installed
+    loop_factory = uvloop.new_event_loop if uvloop else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(main())
@@ -3,18 +3,26 @@
 Token storage and management for Wahoo API
 """
 
-import json
 import logging
 import os
+import tempfile
 import time
+from contextlib import suppress
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# Parsed token files keyed by path, tagged with the (inode, size, mtime) they
+# were read at. A save replaces the file, so the inode changes even when the
+# mtime doesn't tick over.
+_TOKEN_CACHE: dict[str, tuple[tuple[int, int, int], "TokenData"]] = {}
+
 
-@dataclass
+@dataclass(slots=True)
 class TokenData:
     """Container for OAuth token data"""
 
@@ -51,38 +59,64 @@ class TokenStore:
 
     def load(self) -> TokenData | None:
         """Load tokens from file"""
-        if self.token_file.exists():
-            try:
-                with open(self.token_file) as f:
-                    data = json.load(f)
-                    self._token_data = TokenData.from_dict(data)
-                    logger.info(f"Loaded tokens from file: {self.token_file}")
-                    return self._token_data
-            except Exception as e:
-                logger.error(f"Failed to load token file: {e}")
-        else:
-            logger.warning(f"Token file not found: {self.token_file}")
+        key = str(self.token_file)
+        try:
+            stat = self.token_file.stat()
+        except OSError as e:
+            logger.warning(f"Cannot access token file {self.token_file}: {e}")
+            _TOKEN_CACHE.pop(key, None)
+            return None
+
+        # Skip the read and parse if the file hasn't changed since last load
+        version = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        cached = _TOKEN_CACHE.get(key)
+        if cached and cached[0] == version:
+            self._token_data = cached[1]
+            return self._token_data
+
+        try:
+            data = orjson.loads(self.token_file.read_bytes())
+            self._token_data = TokenData.from_dict(data)
+            _TOKEN_CACHE[key] = (version, self._token_data)
+            logger.info(f"Loaded tokens from file: {self.token_file}")
+            return self._token_data
+        except Exception as e:
+            logger.error(f"Failed to load token file: {e}")
 
         return None
 
     def save(self, token_data: TokenData) -> None:
         """Save tokens to file"""
         self._token_data = token_data
+        _TOKEN_CACHE.pop(str(self.token_file), None)
 
+        tmp_file = None
         try:
             # Ensure directory exists
             self.token_file.parent.mkdir(parents=True, exist_ok=True)
 
-            # Write tokens to file
-            with open(self.token_file, "w") as f:
-                json.dump(token_data.to_dict(), f, indent=2)
-
-            # Set restrictive permissions (owner read/write only)
-            os.chmod(self.token_file, 0o600)
+            # Write to a uniquely named sibling temp file and rename it into
+            # place, so a crash mid-write never leaves a truncated token file
+            # behind and concurrent writers never share a temp file. mkstemp
+            # creates it with owner-only (0600) permissions.
+            fd, tmp_file = tempfile.mkstemp(
+                dir=self.token_file.parent,
+                prefix=f"{self.token_file.name}.",
+                suffix=".tmp",
+            )
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(token_data.to_dict(), option=orjson.OPT_INDENT_2))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.token_file)
 
             logger.info(f"Saved tokens to file: {self.token_file}")
         except Exception as e:
             logger.error(f"Failed to save token file: {e}")
+            # Don't leave a stray copy of the tokens behind
+            if tmp_file:
+                with suppress(OSError):
+                    os.unlink(tmp_file)
 
     def update_from_response(self, response_data: dict[str, Any]) -> TokenData:
         """Update tokens from OAuth response"""
@@ -116,6 +150,7 @@ class TokenStore:
     def clear(self) -> None:
         """Clear stored tokens"""
         self._token_data = None
+        _TOKEN_CACHE.pop(str(self.token_file), None)
         if self.token_file and self.token_file.exists():
             try:
                 self.token_file.unlink()
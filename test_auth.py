@@ -3,20 +3,59 @@
 
 import asyncio
 import os
+import random
 import sys
 import time
+from collections.abc import Awaitable, Callable
 from http import HTTPStatus
 
 import httpx
+import orjson
 from dotenv import load_dotenv
 
 from src.server import WahooAPIClient, WahooConfig
 from src.token_store import TokenData, TokenStore
 
+try:
+    import uvloop
+except ImportError:  # Optional dependency, unavailable on Windows
+    uvloop = None
+
 # Load environment variables
 load_dotenv()
 
+# Read configuration once rather than on every helper call
 CLIENT_ID = os.getenv("WAHOO_CLIENT_ID")
+CLIENT_SECRET = os.getenv("WAHOO_CLIENT_SECRET")
+TOKEN_FILE = os.getenv("WAHOO_TOKEN_FILE")
+
+_OAUTH_URL = "https://api.wahooligan.com/oauth/token"
+_WORKOUTS_URL = "https://api.wahooligan.com/v1/workouts"
+
+# The OAuth token endpoint takes a form-encoded body
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+# Smallest possible page, just to prove a token works
+_TEST_PARAMS = {"page": 1, "per_page": 1}
+
+# Upper bound on API probes in flight at once
+_MAX_CONCURRENT_PROBES = 3
+
+# Additional endpoints to probe: display name, client method, item noun
+_ENDPOINT_PROBES = (
+    ("Routes", "list_routes", "route"),
+    ("Plans", "list_plans", "plan"),
+    ("Power Zones", "list_power_zones", "power zone"),
+)
+
+# Substrings of an API error that mean the credentials were rejected
+_AUTH_ERROR_MARKERS = ("401", "Authentication failed")
+
+# Token endpoint responses that mean the request was not processed. Other
+# errors may have already spent a rotating refresh token, so a retry of the
+# (non-idempotent) refresh POST could only fail with invalid_grant.
+_RETRYABLE_STATUSES = frozenset(
+    {HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE}
+)
 
 
 def _validate_client_id() -> bool:
@@ -29,9 +68,14 @@ def _validate_client_id() -> bool:
 
 def _print_token_info(token_data: TokenData) -> None:
     """Print token information for debugging."""
-    print(f"   Client ID: {CLIENT_ID}")
-    print(f"   Refresh token: {token_data.refresh_token[:10]}...")
-    print(f"   Code verifier: {token_data.code_verifier[:10]}...")
+    lines = [
+        f"   Client ID: {CLIENT_ID}",
+        f"   Refresh token: {token_data.refresh_token[:10]}...",
+    ]
+    # Confidential clients authenticate with a secret and have no verifier
+    if token_data.code_verifier:
+        lines.append(f"   Code verifier: {token_data.code_verifier[:10]}...")
+    print("\n".join(lines))
 
 
 def _prepare_refresh_data(token_data: TokenData) -> dict:
@@ -44,10 +88,9 @@ def _prepare_refresh_data(token_data: TokenData) -> dict:
 
     # Check if we should use client_secret (confidential client) or
     # code_verifier (public client)
-    client_secret = os.getenv("WAHOO_CLIENT_SECRET")
-    if client_secret:
+    if CLIENT_SECRET:
         # Confidential client: use client_secret
-        refresh_data["client_secret"] = client_secret
+        refresh_data["client_secret"] = CLIENT_SECRET
         print("   App type: Confidential client (using client_secret)")
     elif token_data.code_verifier:
         # Public client: use PKCE code_verifier
@@ -61,61 +104,105 @@ def _prepare_refresh_data(token_data: TokenData) -> dict:
 
 def _log_request_data(refresh_data: dict, token_data: TokenData) -> None:
     """Log the request data for debugging."""
-    print("\n   Request data:")
-    print(f"   - client_id: {CLIENT_ID}")
-    print("   - grant_type: refresh_token")
-    print(f"   - refresh_token: {token_data.refresh_token[:20]}...")
-    if "code_verifier" in refresh_data:
-        print(f"   - code_verifier: {refresh_data['code_verifier'][:20]}...")
+    lines = [
+        "\n   Request data:",
+        f"   - client_id: {CLIENT_ID}",
+        "   - grant_type: refresh_token",
+        f"   - refresh_token: {token_data.refresh_token[:20]}...",
+    ]
+    if code_verifier := refresh_data.get("code_verifier"):
+        lines.append(f"   - code_verifier: {code_verifier[:20]}...")
     if "client_secret" in refresh_data:
-        print("   - client_secret: [REDACTED]")
+        lines.append("   - client_secret: [REDACTED]")
+    print("\n".join(lines))
 
 
 async def _test_new_token(client, new_token_data: TokenData) -> bool:
     """Test the new access token by making an API call."""
     print("\n   Testing new access token...")
-    test_url = "https://api.wahooligan.com/v1/workouts"
     test_headers = {
         "Authorization": f"Bearer {new_token_data.access_token}",
         "Content-Type": "application/json",
     }
-    test_params = {"page": 1, "per_page": 1}
 
-    test_response = await client.get(test_url, headers=test_headers, params=test_params)
+    # Only the status matters, so leave the body unread
+    async with client.stream(
+        "GET", _WORKOUTS_URL, headers=test_headers, params=_TEST_PARAMS
+    ) as test_response:
+        status_code = test_response.status_code
 
-    if test_response.status_code == HTTPStatus.OK:
+    if status_code == HTTPStatus.OK:
         print("   ✅ New token is valid!")
         return True
     else:
-        print(f"   ❌ New token test failed: {test_response.status_code}")
+        print(f"   ❌ New token test failed: {status_code}")
         return False
 
 
 def _handle_refresh_error(response) -> None:
     """Handle and log refresh token errors."""
-    print(f"   ❌ Refresh failed: {response.status_code}")
-    print(f"   Response: {response.text}")
+    lines = [
+        f"   ❌ Refresh failed: {response.status_code}",
+        f"   Response: {response.text}",
+    ]
 
     # Try to parse error response
     try:
-        error_data = response.json()
+        error_data = orjson.loads(response.content)
         if "error_description" in error_data:
-            print(f"\n   Error details: {error_data['error_description']}")
+            lines.append(f"\n   Error details: {error_data['error_description']}")
 
         # Check if this is a client authentication issue
         if error_data.get("error") == "invalid_client":
-            print("\n   💡 Possible solutions:")
-            print("   1. Ensure WAHOO_CLIENT_ID is correct")
-            print(
-                "   2. Your app might require a client_secret (set WAHOO_CLIENT_SECRET)"
-            )
-            print("   3. The refresh token or code_verifier might be invalid")
-            print("   4. Re-authenticate with 'make auth' to get fresh tokens")
+            lines += [
+                "\n   💡 Possible solutions:",
+                "   1. Ensure WAHOO_CLIENT_ID is correct",
+                "   2. Your app might require a client_secret "
+                "(set WAHOO_CLIENT_SECRET)",
+                "   3. The refresh token or code_verifier might be invalid",
+                "   4. Re-authenticate with 'make auth' to get fresh tokens",
+            ]
     except Exception:
         pass
 
+    print("\n".join(lines))
 
-async def test_refresh_token(token_data: TokenData, token_store: TokenStore) -> bool:
+
+def _retry_delay(
+    response: httpx.Response, attempt: int, base: float, cap: float
+) -> float:
+    """Seconds to wait before retrying, honoring Retry-After when present."""
+    try:
+        # Cap the server's hint too, so one header can't stall the check
+        return min(cap, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        # Exponential backoff with jitter so retries don't arrive in lockstep;
+        # the jitter has no security role
+        jitter = 1 + random.random() * 0.5  # noqa: S311
+        return min(cap, base * 2**attempt) * jitter
+
+
+async def _send_with_backoff(
+    client: httpx.AsyncClient,
+    request: httpx.Request,
+    max_retries: int = 3,
+    base: float = 1.0,
+    cap: float = 30.0,
+) -> httpx.Response:
+    """Send a request, retrying rate-limited and unavailable responses."""
+    for attempt in range(max_retries):
+        response = await client.send(request)
+        if response.status_code not in _RETRYABLE_STATUSES:
+            return response
+        delay = _retry_delay(response, attempt, base, cap)
+        print(f"   ⏳ Got {response.status_code}, retrying in {delay:.1f}s...")
+        await asyncio.sleep(delay)
+    return await client.send(request)
+
+
+async def test_refresh_token(
+    token_data: TokenData, token_store: TokenStore, client: httpx.AsyncClient
+) -> bool:
     """Test the refresh token functionality"""
     if not _validate_client_id():
         return False
@@ -124,109 +211,125 @@ async def test_refresh_token(token_data: TokenData, token_store: TokenStore) ->
     refresh_data = _prepare_refresh_data(token_data)
     _log_request_data(refresh_data, token_data)
 
-    async with httpx.AsyncClient() as client:
-        try:
-            print("\n   Requesting new access token...")
-            headers = {"Content-Type": "application/x-www-form-urlencoded"}
-            response = await client.post(
-                "https://api.wahooligan.com/oauth/token",
-                data=refresh_data,
-                headers=headers,
-            )
-
-            if response.status_code == HTTPStatus.OK:
-                refresh_response = response.json()
-                print("   ✅ Refresh successful!")
-
-                # Update tokens
-                new_token_data = token_store.update_from_response(refresh_response)
-
-                print(f"   New access token: {new_token_data.access_token[:10]}...")
-                if new_token_data.expires_at:
-                    expires_in = int(new_token_data.expires_at - time.time())
-                    print(f"   Expires in: {expires_in} seconds")
-
-                return await _test_new_token(client, new_token_data)
-            else:
-                _handle_refresh_error(response)
-                return False
-
-        except Exception as e:
-            print(f"   ❌ Error during refresh: {str(e)}")
+    try:
+        print("\n   Requesting new access token...")
+        request = client.build_request(
+            "POST",
+            _OAUTH_URL,
+            data=refresh_data,
+            headers=_FORM_HEADERS,
+        )
+        response = await _send_with_backoff(client, request)
+
+        if response.status_code == HTTPStatus.OK:
+            refresh_response = orjson.loads(response.content)
+
+            # Update tokens
+            new_token_data = token_store.update_from_response(refresh_response)
+
+            lines = [
+                "   ✅ Refresh successful!",
+                f"   New access token: {new_token_data.access_token[:10]}...",
+            ]
+            if new_token_data.expires_at:
+                expires_in = int(new_token_data.expires_at - time.time())
+                lines.append(f"   Expires in: {expires_in} seconds")
+            print("\n".join(lines))
+
+            return await _test_new_token(client, new_token_data)
+        else:
+            _handle_refresh_error(response)
             return False
 
+    except Exception as e:
+        print(f"   ❌ Error during refresh: {e!s}")
+        return False
+
 
-def _validate_token_file() -> tuple[str | None, str | None]:
-    """Validate token file exists and return path and error message."""
-    token_file = os.getenv("WAHOO_TOKEN_FILE")
-    if not token_file:
-        error_msg = (
+def _load_token_data() -> tuple[TokenData, TokenStore] | str:
+    """Load token data from the configured file, or return an error message."""
+    if not TOKEN_FILE:
+        return (
             "❌ Error: WAHOO_TOKEN_FILE environment variable is required\n"
             "Set it to the path where tokens should be stored "
             "(e.g., export WAHOO_TOKEN_FILE=token.json)"
         )
-        return None, error_msg
-    return token_file, None
 
-
-def _load_token_data(
-    token_file: str,
-) -> tuple[TokenData | None, TokenStore | None, str | None]:
-    """Load token data from file and return data, store, and error message."""
     try:
-        token_store = TokenStore(token_file)
+        token_store = TokenStore(TOKEN_FILE)
+        # A single stat decides whether the file exists before it is read
         token_data = token_store.load()
     except Exception as e:
-        return None, None, f"❌ Error initializing token store: {e}"
+        return f"❌ Error initializing token store: {e}"
 
     if not token_data or not token_data.access_token:
-        error_msg = (
-            f"❌ Error: No valid token found in {token_file}\n"
+        return (
+            f"❌ Error: No valid token found in {TOKEN_FILE}\n"
             "Run 'make auth' to obtain an access token"
         )
-        return None, None, error_msg
 
-    return token_data, token_store, None
+    return token_data, token_store
 
 
 def _print_token_status(token_data: TokenData, token_store: TokenStore) -> None:
     """Print token status information."""
-    print("🔍 Testing Wahoo API credentials...")
-    print(f"   Token: {token_data.access_token[:10]}...")
-    print(f"   Source: Token file ({token_store.token_file})")
+    lines = [
+        "🔍 Testing Wahoo API credentials...",
+        f"   Token: {token_data.access_token[:10]}...",
+        f"   Source: Token file ({token_store.token_file})",
+    ]
 
     # Check if token is expired
     if token_data.expires_at:
         if token_data.is_expired(buffer_seconds=0):
-            print("   ⚠️  Warning: Token appears to be expired")
+            lines.append("   ⚠️  Warning: Token appears to be expired")
         elif token_data.is_expired():
-            print("   ⚠️  Warning: Token will expire soon")
+            lines.append("   ⚠️  Warning: Token will expire soon")
+    print("\n".join(lines))
+
+
+def _format_endpoint_result(name: str, result: list | BaseException, noun: str) -> str:
+    """Describe the outcome of a single endpoint probe."""
+    if isinstance(result, BaseException):
+        return f"   {name}: ❌ Failed ({result!s})"
+    return f"   {name}: ✅ Found {len(result)} {noun}(s)"
+
+
+async def _probe_endpoint(
+    semaphore: asyncio.Semaphore, fetch: Callable[[], Awaitable[list]]
+) -> list:
+    """Run one endpoint probe, retrying once if it gets rate limited."""
+    async with semaphore:
+        try:
+            return await fetch()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != HTTPStatus.TOO_MANY_REQUESTS:
+                raise
+            await asyncio.sleep(_retry_delay(e.response, 0, 1.0, 30.0))
+            return await fetch()
 
 
 async def _test_additional_endpoints(client) -> None:
     """Test additional API endpoints and print results."""
     print("\n🔍 Testing additional API endpoints...")
 
-    # Test routes endpoint
-    try:
-        routes = await client.list_routes()
-        print(f"   Routes: ✅ Found {len(routes)} route(s)")
-    except Exception as e:
-        print(f"   Routes: ❌ Failed ({str(e)})")
-
-    # Test plans endpoint
-    try:
-        plans = await client.list_plans()
-        print(f"   Plans: ✅ Found {len(plans)} plan(s)")
-    except Exception as e:
-        print(f"   Plans: ❌ Failed ({str(e)})")
-
-    # Test power zones endpoint
-    try:
-        power_zones = await client.list_power_zones()
-        print(f"   Power Zones: ✅ Found {len(power_zones)} power zone(s)")
-    except Exception as e:
-        print(f"   Power Zones: ❌ Failed ({str(e)})")
+    # The probes are independent, so run them together; one failure must not
+    # cancel the others. The semaphore keeps us inside the API rate limits.
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_PROBES)
+    results = await asyncio.gather(
+        *(
+            _probe_endpoint(semaphore, getattr(client, method))
+            for _, method, _ in _ENDPOINT_PROBES
+        ),
+        return_exceptions=True,
+    )
+
+    print(
+        "\n".join(
+            _format_endpoint_result(name, result, noun)
+            for (name, _, noun), result in zip(_ENDPOINT_PROBES, results, strict=True)
+        )
+    )
 
 
 def _check_refresh_token_availability(token_data: TokenData) -> bool:
@@ -234,62 +337,88 @@ def _check_refresh_token_availability(token_data: TokenData) -> bool:
     if token_data.refresh_token and token_data.code_verifier:
         return True
     else:
-        print("\n⚠️  No refresh token available to test")
+        lines = ["\n⚠️  No refresh token available to test"]
         if not token_data.refresh_token:
-            print("   Missing: refresh_token")
+            lines.append("   Missing: refresh_token")
         if not token_data.code_verifier:
-            print("   Missing: code_verifier")
+            lines.append("   Missing: code_verifier")
+        print("\n".join(lines))
         return False
 
 
 def _handle_api_error(e: Exception) -> None:
     """Handle and log API errors."""
-    if "401" in str(e) or "Authentication failed" in str(e):
-        print("❌ Invalid credentials: Authentication failed")
-        print("   The access token may be expired or invalid")
+    message = str(e)
+    if any(marker in message for marker in _AUTH_ERROR_MARKERS):
+        print(
+            "❌ Invalid credentials: Authentication failed\n"
+            "   The access token may be expired or invalid"
+        )
     else:
-        print(f"❌ Error testing credentials: {str(e)}")
+        print(f"❌ Error testing credentials: {message}")
 
 
 async def test_wahoo_credentials():
     """Test if Wahoo credentials are valid using the WahooAPIClient"""
-    # Validate token file
-    token_file, error = _validate_token_file()
-    if error:
-        print(error)
-        return False
-
     # Load token data
-    token_data, token_store, error = _load_token_data(token_file)
-    if error:
-        print(error)
+    loaded = _load_token_data()
+    if isinstance(loaded, str):
+        print(loaded)
         return False
+    token_data, token_store = loaded
 
     _print_token_status(token_data, token_store)
 
-    # Use WahooAPIClient to test endpoints
+    # One connection pool for every request, so the TLS handshake with the
+    # API host happens only once
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=5, keepalive_expiry=30),
+        timeout=httpx.Timeout(10.0, connect=5.0),
+    )
+
     try:
+        # WahooAPIClient would refresh an expired or expiring token before its
+        # first request anyway, so test the refresh up front and let the
+        # probes below run with the new token
+        refreshed = False
+        if token_data.is_expired() and token_data.refresh_token:
+            print("\n🔄 Token expired or expiring soon, testing refresh token...")
+            if not await test_refresh_token(token_data, token_store, http_client):
+                return False
+            refreshed = True
+
+        # Use WahooAPIClient to test endpoints
         config = WahooConfig()
-        async with WahooAPIClient(config) as client:
+        async with WahooAPIClient(config, http_client=http_client) as client:
             # Test workouts endpoint
             workouts = await client.list_workouts(page=1, per_page=1)
-            print("✅ Success! Credentials are valid")
-            print(f"   Found {len(workouts)} workout(s)")
+            print(
+                "✅ Success! Credentials are valid\n"
+                f"   Found {len(workouts)} workout(s)"
+            )
 
             await _test_additional_endpoints(client)
 
-            # Test refresh token if available
-            if _check_refresh_token_availability(token_data):
+            # Test refresh token if available and not exercised above
+            if not refreshed and _check_refresh_token_availability(token_data):
                 print("\n🔄 Testing refresh token...")
-                refresh_success = await test_refresh_token(token_data, token_store)
+                refresh_success = await test_refresh_token(
+                    token_data, token_store, http_client
+                )
                 return refresh_success
             return True
 
     except Exception as e:
         _handle_api_error(e)
         return False
+    finally:
+        await http_client.aclose()
 
 
 if __name__ == "__main__":
-    success = asyncio.run(test_wahoo_credentials())
+    # Prefer uvloop's libuv-backed event loop when it is installed
+    loop_factory = uvloop.new_event_loop if uvloop else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        success = runner.run(test_wahoo_credentials())
     sys.exit(0 if success else 1)
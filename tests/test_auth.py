@@ -10,12 +10,13 @@ import os
 import secrets
 import time
 from http import HTTPStatus
-from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
 from urllib.parse import urlencode
 
 import pytest
-from aiohttp import web
-from aiohttp.test_utils import AioHTTPTestCase
+import pytest_asyncio
+from aiohttp import test_utils, web
 
 from src.token_store import TokenData
 
@@ -24,131 +25,142 @@ os.environ.setdefault("WAHOO_CLIENT_ID", "test_client_id")
 os.environ.setdefault("WAHOO_CLIENT_SECRET", "test_client_secret")
 os.environ.setdefault("WAHOO_TOKEN_FILE", "test_token.json")
 
+from src import auth  # noqa: E402
 
-class TestAuthModule(AioHTTPTestCase):
-    """Test the auth module functions."""
+# Unpadded base64 length of a SHA-256 digest: 32 bytes -> 43 chars
+PKCE_CHALLENGE_LEN = (hashlib.sha256().digest_size * 4 + 2) // 3
 
-    async def get_application(self):
-        """Create test application."""
-        # Import auth module functions to test
-        from src import auth  # noqa: PLC0415
 
-        app = web.Application()
-        app.router.add_get("/callback", auth.callback_handler)
-        return app
+class FakeResponse:
+    """Minimal stand-in for an httpx.Response returned by the token endpoint"""
 
-    def setUp(self):
-        """Set up test environment."""
-        super().setUp()
-        # Clear global variables
-        import src.auth  # noqa: PLC0415
+    __slots__ = ("_json", "status_code", "text")
+
+    def __init__(self, status_code, json_data=None, text=""):
+        self.status_code = status_code
+        self._json = json_data
+        self.text = text
+
+    def json(self):
+        return self._json
+
+
+class FakeClient:
+    """Minimal stand-in for httpx.AsyncClient that answers every POST the same"""
+
+    def __init__(self, response=None, error=None):
+        self._response = response
+        self._error = error
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def post(self, *args, **kwargs):
+        if self._error is not None:
+            raise self._error
+        return self._response
+
+
+def fake_client_factory(**kwargs):
+    """Build a replacement for the httpx.AsyncClient class"""
+    return lambda *args, **client_kwargs: FakeClient(**kwargs)
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def callback_client():
+    """Serve the OAuth callback handler once for all callback tests."""
+    app = web.Application()
+    app.router.add_get("/callback", auth.callback_handler)
+    async with test_utils.TestClient(test_utils.TestServer(app)) as client:
+        yield client
+
+
+@pytest.mark.asyncio(loop_scope="module")
+class TestAuthModule:
+    """Test the auth module functions."""
 
-        src.auth.access_token = None
-        src.auth.refresh_token = None
+    @pytest.fixture(autouse=True)
+    def auth_config(self, monkeypatch):
+        """Point the auth module at fixed OAuth settings for every test."""
+        monkeypatch.setattr(auth, "CLIENT_ID", "test_client_id")
+        monkeypatch.setattr(auth, "CLIENT_SECRET", "test_client_secret")
+        monkeypatch.setattr(auth, "REDIRECT_URI", "http://localhost:8080/callback")
+        monkeypatch.setattr(auth, "code_verifier", "test_verifier")
+        monkeypatch.setattr(auth, "TOKEN_URL", "https://api.wahooligan.com/oauth/token")
+        # Clear global variables
+        monkeypatch.setattr(auth, "access_token", None)
+        monkeypatch.setattr(auth, "refresh_token", None)
 
-    async def test_callback_handler_success(self):
+    async def test_callback_handler_success(self, callback_client):
         """Test successful OAuth callback handling."""
-        with (
-            patch("src.auth.CLIENT_ID", "test_client_id"),
-            patch("src.auth.CLIENT_SECRET", "test_client_secret"),
-            patch("src.auth.REDIRECT_URI", "http://localhost:8080/callback"),
-            patch("src.auth.code_verifier", "test_verifier"),
-            patch("src.auth.TOKEN_URL", "https://api.wahooligan.com/oauth/token"),
-            patch("src.auth.token_store") as mock_store,
-        ):
+        with patch("src.auth.token_store") as mock_store:
             # Mock the token store
             mock_store.save = Mock()
 
-            # Mock the HTTP client response
-            mock_response = MagicMock()
-            mock_response.status_code = HTTPStatus.OK
-            mock_response.json.return_value = {
-                "access_token": "test_access_token",
-                "refresh_token": "test_refresh_token",
-                "expires_in": 7200,
-                "token_type": "Bearer",
-                "scope": "user_read workouts_read",
-            }
-
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = AsyncMock()
-                mock_client.post.return_value = mock_response
-                mock_client.__aenter__.return_value = mock_client
-                mock_client_class.return_value = mock_client
+            # Stub the HTTP client response
+            token_response = FakeResponse(
+                HTTPStatus.OK,
+                {
+                    "access_token": "test_access_token",
+                    "refresh_token": "test_refresh_token",
+                    "expires_in": 7200,
+                    "token_type": "Bearer",
+                    "scope": "user_read workouts_read",
+                },
+            )
 
+            with patch(
+                "httpx.AsyncClient", fake_client_factory(response=token_response)
+            ):
                 # Test successful callback
-                response = await self.client.request(
-                    "GET", "/callback?code=test_auth_code"
-                )
+                response = await callback_client.get("/callback?code=test_auth_code")
 
-                self.assertEqual(response.status, HTTPStatus.OK)
-                self.assertIn("Authentication Successful", await response.text())
+                assert response.status == HTTPStatus.OK
+                assert "Authentication Successful" in await response.text()
 
                 # Verify token store was called
                 mock_store.save.assert_called_once()
 
-    async def test_callback_handler_oauth_error(self):
+    async def test_callback_handler_oauth_error(self, callback_client):
         """Test OAuth error handling in callback."""
-        response = await self.client.request(
-            "GET", "/callback?error=access_denied&error_description=User%20denied"
+        response = await callback_client.get(
+            "/callback?error=access_denied&error_description=User%20denied"
         )
 
-        self.assertEqual(response.status, HTTPStatus.BAD_REQUEST)
-        self.assertIn("OAuth Error", await response.text())
+        assert response.status == HTTPStatus.BAD_REQUEST
+        assert "OAuth Error" in await response.text()
 
-    async def test_callback_handler_no_code(self):
+    async def test_callback_handler_no_code(self, callback_client):
         """Test callback without authorization code."""
-        response = await self.client.request("GET", "/callback")
+        response = await callback_client.get("/callback")
 
-        self.assertEqual(response.status, HTTPStatus.BAD_REQUEST)
-        self.assertIn("No authorization code received", await response.text())
+        assert response.status == HTTPStatus.BAD_REQUEST
+        assert "No authorization code received" in await response.text()
 
-    async def test_callback_handler_token_exchange_failure(self):
+    async def test_callback_handler_token_exchange_failure(self, callback_client):
         """Test token exchange failure."""
-        with (
-            patch("src.auth.CLIENT_ID", "test_client_id"),
-            patch("src.auth.CLIENT_SECRET", "test_client_secret"),
-            patch("src.auth.REDIRECT_URI", "http://localhost:8080/callback"),
-            patch("src.auth.code_verifier", "test_verifier"),
-            patch("src.auth.TOKEN_URL", "https://api.wahooligan.com/oauth/token"),
-        ):
-            # Mock failed HTTP response
-            mock_response = MagicMock()
-            mock_response.status_code = HTTPStatus.BAD_REQUEST
-            mock_response.text = "invalid_grant"
-
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = AsyncMock()
-                mock_client.post.return_value = mock_response
-                mock_client.__aenter__.return_value = mock_client
-                mock_client_class.return_value = mock_client
+        # Stub failed HTTP response
+        token_response = FakeResponse(HTTPStatus.BAD_REQUEST, text="invalid_grant")
 
-                response = await self.client.request(
-                    "GET", "/callback?code=invalid_code"
-                )
+        with patch("httpx.AsyncClient", fake_client_factory(response=token_response)):
+            response = await callback_client.get("/callback?code=invalid_code")
 
-                self.assertEqual(response.status, HTTPStatus.INTERNAL_SERVER_ERROR)
-                self.assertIn("Error exchanging code", await response.text())
+            assert response.status == HTTPStatus.INTERNAL_SERVER_ERROR
+            assert "Error exchanging code" in await response.text()
 
-    async def test_callback_handler_network_error(self):
+    async def test_callback_handler_network_error(self, callback_client):
         """Test network error during token exchange."""
-        with (
-            patch("src.auth.CLIENT_ID", "test_client_id"),
-            patch("src.auth.CLIENT_SECRET", "test_client_secret"),
-            patch("src.auth.REDIRECT_URI", "http://localhost:8080/callback"),
-            patch("src.auth.code_verifier", "test_verifier"),
-            patch("src.auth.TOKEN_URL", "https://api.wahooligan.com/oauth/token"),
+        with patch(
+            "httpx.AsyncClient",
+            fake_client_factory(error=Exception("Network error")),
         ):
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = AsyncMock()
-                mock_client.post.side_effect = Exception("Network error")
-                mock_client.__aenter__.return_value = mock_client
-                mock_client_class.return_value = mock_client
+            response = await callback_client.get("/callback?code=test_code")
 
-                response = await self.client.request("GET", "/callback?code=test_code")
-
-                self.assertEqual(response.status, HTTPStatus.INTERNAL_SERVER_ERROR)
-                self.assertIn("Error: Network error", await response.text())
+            assert response.status == HTTPStatus.INTERNAL_SERVER_ERROR
+            assert "Error: Network error" in await response.text()
 
 
 class TestPKCEGeneration:
@@ -173,20 +185,12 @@ class TestPKCEGeneration:
         code_verifier = "test_verifier_123456789012345678901234567890"
 
         # Generate challenge like the auth module does
-        code_challenge = (
-            base64.urlsafe_b64encode(hashlib.sha256(code_verifier.encode()).digest())
-            .decode("utf-8")
-            .rstrip("=")
-        )
-
-        # Verify it's correct SHA256 hash
-        expected_hash = hashlib.sha256(code_verifier.encode()).digest()
-        expected_challenge = (
-            base64.urlsafe_b64encode(expected_hash).decode("utf-8").rstrip("=")
-        )
+        digest = hashlib.sha256(code_verifier.encode()).digest()
+        code_challenge = base64.urlsafe_b64encode(digest).decode("utf-8").rstrip("=")
 
-        assert code_challenge == expected_challenge
-        assert len(code_challenge) == 43  # SHA256 -> 32 bytes -> 43 chars
+        # Verify it's the known S256 challenge for this verifier
+        assert code_challenge == "A4bYaW2MkRBTI3cJL9c45d3cHkWU7GfrcwIMTJP5uow"
+        assert len(code_challenge) == PKCE_CHALLENGE_LEN
 
 
 class TestRedirectUriGeneration:
@@ -261,6 +265,21 @@ class TestRedirectUriGeneration:
             assert redirect_uri == "http://localhost:8080/callback"
 
 
+def load_auth_config():
+    """Read the auth settings from the environment like the auth module does"""
+    return SimpleNamespace(
+        host=os.getenv("WAHOO_AUTH_HOST", "localhost"),
+        port=int(os.getenv("WAHOO_AUTH_PORT", "8080")),
+        scheme=os.getenv("WAHOO_REDIRECT_SCHEME", "http"),
+        auth_url=os.getenv(
+            "WAHOO_AUTH_URL", "https://api.wahooligan.com/oauth/authorize"
+        ),
+        token_url=os.getenv(
+            "WAHOO_TOKEN_URL", "https://api.wahooligan.com/oauth/token"
+        ),
+    )
+
+
 class TestAuthConfiguration:
     """Test authentication configuration and environment variables."""
 
@@ -268,13 +287,11 @@ class TestAuthConfiguration:
         """Test default configuration values."""
         with patch.dict(os.environ, {}, clear=True):
             # Test defaults match auth module
-            host = os.getenv("WAHOO_AUTH_HOST", "localhost")
-            port = int(os.getenv("WAHOO_AUTH_PORT", "8080"))
-            scheme = os.getenv("WAHOO_REDIRECT_SCHEME", "http")
+            config = load_auth_config()
 
-            assert host == "localhost"
-            assert port == 8080
-            assert scheme == "http"
+            assert config.host == "localhost"
+            assert config.port == 8080
+            assert config.scheme == "http"
 
     def test_custom_configuration(self):
         """Test custom configuration from environment."""
@@ -288,21 +305,13 @@ class TestAuthConfiguration:
                 "WAHOO_TOKEN_URL": "https://custom.example.com/oauth/token",
             },
         ):
-            host = os.getenv("WAHOO_AUTH_HOST", "localhost")
-            port = int(os.getenv("WAHOO_AUTH_PORT", "8080"))
-            scheme = os.getenv("WAHOO_REDIRECT_SCHEME", "http")
-            auth_url = os.getenv(
-                "WAHOO_AUTH_URL", "https://api.wahooligan.com/oauth/authorize"
-            )
-            token_url = os.getenv(
-                "WAHOO_TOKEN_URL", "https://api.wahooligan.com/oauth/token"
-            )
+            config = load_auth_config()
 
-            assert host == "0.0.0.0"  # noqa: S104
-            assert port == 9000
-            assert scheme == "https"
-            assert auth_url == "https://custom.example.com/oauth/authorize"
-            assert token_url == "https://custom.example.com/oauth/token"
+            assert config.host == "0.0.0.0"  # noqa: S104
+            assert config.port == 9000
+            assert config.scheme == "https"
+            assert config.auth_url == "https://custom.example.com/oauth/authorize"
+            assert config.token_url == "https://custom.example.com/oauth/token"
 
 
 class TestTokenStorage:
@@ -396,18 +405,19 @@ async def test_server_timeout_simulation():
     """Test server timeout behavior simulation."""
     # Simulate the timeout logic from the auth module
     timeout = 0.1  # Short timeout for testing
-    start_time = asyncio.get_event_loop().time()
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
     access_token = None
 
     # Simulate waiting loop
     while access_token is None:
-        if asyncio.get_event_loop().time() - start_time > timeout:
+        if loop.time() - start_time > timeout:
             break
         await asyncio.sleep(0.01)
 
     # Should have timed out
     assert access_token is None
-    assert asyncio.get_event_loop().time() - start_time >= timeout
+    assert loop.time() - start_time >= timeout
 
 
 class TestErrorHandling:
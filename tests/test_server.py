@@ -1,9 +1,15 @@
-import json
+import asyncio
 import time
-from unittest.mock import AsyncMock, MagicMock, patch
+from operator import attrgetter
+from unittest.mock import AsyncMock, patch
+from urllib.parse import parse_qs
 
+import httpx
+import orjson
 import pytest
+import pytest_asyncio
 
+from src import server
 from src.models import (
     CreatePlanRequest,
     Workout,
@@ -14,28 +20,82 @@ from src.models import (
 from src.server import WahooAPIClient, WahooConfig, call_tool, list_tools
 from src.token_store import TokenData, TokenStore
 
+API_URL = "https://api.wahooligan.com"
 
-@pytest.fixture
+# Fixed reference time for token expiry values, taken once per test session
+_NOW = time.time()
+
+
+@pytest_asyncio.fixture(autouse=True, loop_scope="module")
+async def reset_shared_client(monkeypatch):
+    """Give each test a fresh shared client for call_tool"""
+    monkeypatch.setattr(server, "_client", None)
+    yield
+    if server._client is not None:
+        await server._client.aclose()
+
+
+def async_return(value):
+    """Stand in for an async client method that returns value"""
+
+    async def method(*args, **kwargs):
+        return value
+
+    return method
+
+
+def async_raise(exc):
+    """Stand in for an async client method that raises exc"""
+
+    async def method(*args, **kwargs):
+        raise exc
+
+    return method
+
+
+@pytest.fixture(scope="session")
 def wahoo_config():
     return WahooConfig()
 
 
-@pytest.fixture
-def temp_token_file(tmp_path):
-    """Create a temporary token file with test data"""
-    token_file = tmp_path / "test_token.json"
-    token_data = {
-        "access_token": "test_token",
-        "refresh_token": "test_refresh_token",
-        "code_verifier": "test_verifier",
-        "expires_at": time.time() + 7200,
-        "token_type": "Bearer",
-    }
-    token_file.write_text(json.dumps(token_data))
-    return str(token_file)
+class InMemoryTokenStore(TokenStore):
+    """TokenStore that keeps its tokens in memory instead of on disk"""
+
+    def __init__(self, token_data: TokenData):
+        super().__init__("test_token.json")
+        self._token_data = token_data
+
+    def load(self) -> TokenData | None:
+        return self._token_data
+
+    def save(self, token_data: TokenData) -> None:
+        self._token_data = token_data
 
 
 @pytest.fixture
+def token_store(monkeypatch):
+    """Serve the test tokens from memory for tests that don't exercise the file"""
+    store = InMemoryTokenStore(
+        TokenData(
+            access_token="test_token",
+            refresh_token="test_refresh_token",
+            code_verifier="test_verifier",
+            expires_at=_NOW + 7200,
+        )
+    )
+    monkeypatch.setattr(server, "TOKEN_FILE", str(store.token_file))
+    monkeypatch.setattr(server, "TokenStore", lambda token_file: store)
+    return store
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def api_client(wahoo_config, token_store):
+    """Give each test its own client backed by the in-memory token store"""
+    async with WahooAPIClient(wahoo_config) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
 def mock_workouts_response():
     return {
         "workouts": [
@@ -69,24 +129,22 @@ def mock_workouts_response():
     }
 
 
-@pytest.fixture
-def mock_workout_detail():
-    return {
-        "id": 1,
-        "name": "Morning Run",
-        "starts": "2024-01-15T07:00:00.000Z",
-        "minutes": 45,
-        "workout_type_id": 1,
-        "workout_token": "token_1",
-        "plan_id": None,
-        "route_id": None,
-        "workout_summary": None,
-        "created_at": "2024-01-15T08:00:00.000Z",
-        "updated_at": "2024-01-15T08:00:00.000Z",
-    }
+@pytest.fixture(scope="session")
+def mock_workout_detail(mock_workouts_response):
+    return mock_workouts_response["workouts"][0]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def workout_objects(mock_workouts_response):
+    return [Workout(**w) for w in mock_workouts_response["workouts"]]
+
+
+@pytest.fixture(scope="session")
+def workout_object(mock_workout_detail):
+    return Workout(**mock_workout_detail)
+
+
+@pytest.fixture(scope="session")
 def mock_routes_response():
     return {
         "routes": [
@@ -108,25 +166,12 @@ def mock_routes_response():
     }
 
 
-@pytest.fixture
-def mock_route_detail():
-    return {
-        "id": 1,
-        "user_id": 123,
-        "name": "Mountain Loop",
-        "description": "A challenging mountain route",
-        "file": {"url": "https://example.com/route1.fit"},
-        "workout_type_family_id": 0,
-        "external_id": "route_001",
-        "start_lat": 37.7749,
-        "start_lng": -122.4194,
-        "distance": 25.5,
-        "ascent": 500.0,
-        "descent": 450.0,
-    }
+@pytest.fixture(scope="session")
+def mock_route_detail(mock_routes_response):
+    return mock_routes_response["routes"][0]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_plans_response():
     return {
         "plans": [
@@ -145,22 +190,12 @@ def mock_plans_response():
     }
 
 
-@pytest.fixture
-def mock_plan_detail():
-    return {
-        "id": 1,
-        "user_id": 123,
-        "name": "Training Plan A",
-        "description": "Basic training plan",
-        "file": {"url": "https://example.com/plan1.json"},
-        "workout_type_family_id": 0,
-        "external_id": "plan_001",
-        "provider_updated_at": "2024-01-15T10:00:00.000Z",
-        "deleted": False,
-    }
+@pytest.fixture(scope="session")
+def mock_plan_detail(mock_plans_response):
+    return mock_plans_response["plans"][0]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_power_zones_response():
     return {
         "power_zones": [
@@ -187,212 +222,272 @@ def mock_power_zones_response():
     }
 
 
-@pytest.fixture
-def mock_power_zone_detail():
-    return {
-        "id": 1,
-        "user_id": 123,
-        "zone_1": 100,
-        "zone_2": 150,
-        "zone_3": 200,
-        "zone_4": 250,
-        "zone_5": 300,
-        "zone_6": 350,
-        "zone_7": 400,
-        "ftp": 250,
-        "zone_count": 7,
-        "workout_type_id": 0,
-        "workout_type_family_id": 0,
-        "workout_type_location_id": 0,
-        "critical_power": 275,
-        "created_at": "2024-01-15T12:00:00.000Z",
-        "updated_at": "2024-01-15T12:00:00.000Z",
-    }
+@pytest.fixture(scope="session")
+def mock_power_zone_detail(mock_power_zones_response):
+    return mock_power_zones_response["power_zones"][0]
 
 
+@pytest.fixture
+def api_response(request, httpx_mock):
+    """Serve the named payload fixture for a GET of the parametrized API path"""
+    path, payload = request.param
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{API_URL}{path}",
+        json=request.getfixturevalue(payload),
+        status_code=200,
+    )
+
+
+@pytest.mark.asyncio(loop_scope="module")
 class TestWahooAPIClient:
-    @pytest.mark.asyncio
-    async def test_list_workouts(
+    @pytest.mark.parametrize(
+        ("method", "api_response", "expected"),
+        [
+            (
+                "list_workouts",
+                ("/v1/workouts?page=1&per_page=30", "mock_workouts_response"),
+                [
+                    {"name": "Morning Run", "id": 1, "workout_token": "token_1"},
+                    {"name": "Evening Ride", "plan_id": 123},
+                ],
+            ),
+            (
+                "list_routes",
+                ("/v1/routes", "mock_routes_response"),
+                [{"name": "Mountain Loop", "id": 1, "distance": 25.5}],
+            ),
+            (
+                "list_plans",
+                ("/v1/plans", "mock_plans_response"),
+                [{"name": "Training Plan A", "id": 1, "deleted": False}],
+            ),
+            (
+                "list_power_zones",
+                ("/v1/power_zones", "mock_power_zones_response"),
+                [{"ftp": 250, "id": 1, "zone_7": 400}],
+            ),
+        ],
+        indirect=["api_response"],
+    )
+    async def test_list_endpoints(self, method, api_response, expected, api_client):
+        items = await getattr(api_client, method)()
+
+        assert len(items) == len(expected)
+        for item, fields in zip(items, expected, strict=True):
+            for field, value in fields.items():
+                assert getattr(item, field) == value
+
+    @pytest.mark.parametrize(
+        ("method", "api_response", "expected"),
+        [
+            (
+                "get_workout",
+                ("/v1/workouts/1", "mock_workout_detail"),
+                {
+                    "id": 1,
+                    "name": "Morning Run",
+                    "workout_token": "token_1",
+                    "minutes": 45,
+                },
+            ),
+            (
+                "get_route",
+                ("/v1/routes/1", "mock_route_detail"),
+                {
+                    "id": 1,
+                    "name": "Mountain Loop",
+                    "file.url": "https://example.com/route1.fit",
+                },
+            ),
+            (
+                "get_plan",
+                ("/v1/plans/1", "mock_plan_detail"),
+                {
+                    "id": 1,
+                    "name": "Training Plan A",
+                    "file.url": "https://example.com/plan1.json",
+                },
+            ),
+            (
+                "get_power_zone",
+                ("/v1/power_zones/1", "mock_power_zone_detail"),
+                {"id": 1, "ftp": 250, "critical_power": 275},
+            ),
+        ],
+        indirect=["api_response"],
+    )
+    async def test_get_endpoints(self, method, api_response, expected, api_client):
+        item = await getattr(api_client, method)(1)
+
+        for field, value in expected.items():
+            assert attrgetter(field)(item) == value
+
+    async def test_list_workouts_with_filters(
         self,
-        wahoo_config,
+        api_client,
         mock_workouts_response,
-        temp_token_file,
-        monkeypatch,
         httpx_mock,
     ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
-
-        # Mock the API response
+        # Mock the API response with query parameters
         httpx_mock.add_response(
             method="GET",
-            url="https://api.wahooligan.com/v1/workouts?page=1&per_page=30",
+            url=httpx.URL(
+                f"{API_URL}/v1/workouts",
+                params={
+                    "page": 2,
+                    "per_page": 50,
+                    "created_after": "2024-01-01",
+                    "created_before": "2024-01-31",
+                },
+            ),
             json=mock_workouts_response,
             status_code=200,
         )
 
-        async with WahooAPIClient(wahoo_config) as client:
-            workouts = await client.list_workouts()
+        workouts = await api_client.list_workouts(
+            page=2, per_page=50, start_date="2024-01-01", end_date="2024-01-31"
+        )
 
-            assert len(workouts) == 2
-            assert workouts[0].name == "Morning Run"
-            assert workouts[0].id == 1
-            assert workouts[0].workout_token == "token_1"
-            assert workouts[1].name == "Evening Ride"
-            assert workouts[1].plan_id == 123
+        assert [workout.id for workout in workouts] == [1, 2]
+        request = httpx_mock.get_request()
+        assert request.url.path == "/v1/workouts"
+        assert dict(request.url.params) == {
+            "page": "2",
+            "per_page": "50",
+            "created_after": "2024-01-01",
+            "created_before": "2024-01-31",
+        }
 
-    @pytest.mark.asyncio
-    async def test_list_workouts_with_filters(
+    async def test_shared_http_client(
         self,
         wahoo_config,
         mock_workouts_response,
-        temp_token_file,
-        monkeypatch,
+        token_store,
         httpx_mock,
     ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
-
-        # Mock the API response with query parameters
         httpx_mock.add_response(
             method="GET",
-            url="https://api.wahooligan.com/v1/workouts?page=2&per_page=50&created_after=2024-01-01&created_before=2024-01-31",
+            url=f"{API_URL}/v1/workouts?page=1&per_page=30",
             json=mock_workouts_response,
             status_code=200,
         )
 
-        async with WahooAPIClient(wahoo_config) as client:
-            await client.list_workouts(
-                page=2, per_page=50, start_date="2024-01-01", end_date="2024-01-31"
+        async with httpx.AsyncClient() as http_client:
+            client = WahooAPIClient(wahoo_config, http_client=http_client)
+            async with client:
+                assert client.client is http_client
+                assert len(await client.list_workouts()) == 2
+
+            # The token goes out per request; the borrowed client is left
+            # unconfigured and open for its owner to close
+            assert httpx_mock.get_request().headers["Authorization"] == (
+                "Bearer test_token"
             )
+            assert "Authorization" not in http_client.headers
+            assert not http_client.is_closed
 
-    @pytest.mark.asyncio
-    async def test_get_workout(
+    async def test_list_all_workouts(
         self,
-        wahoo_config,
-        mock_workout_detail,
-        temp_token_file,
-        monkeypatch,
+        api_client,
+        mock_workouts_response,
         httpx_mock,
     ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
+        third_workout = {**mock_workouts_response["workouts"][0], "id": 3}
 
-        # Mock the API response
+        # First page reports the total, remaining pages are fetched concurrently
         httpx_mock.add_response(
             method="GET",
-            url="https://api.wahooligan.com/v1/workouts/1",
-            json=mock_workout_detail,
+            url=f"{API_URL}/v1/workouts?page=1&per_page=2",
+            json={**mock_workouts_response, "total": 3},
+            status_code=200,
+        )
+        httpx_mock.add_response(
+            method="GET",
+            url=f"{API_URL}/v1/workouts?page=2&per_page=2",
+            json={"workouts": [third_workout], "total": 3},
             status_code=200,
         )
 
-        async with WahooAPIClient(wahoo_config) as client:
-            workout = await client.get_workout(1)
+        workouts = await api_client.list_all_workouts(per_page=2)
 
-            assert workout.id == 1
-            assert workout.name == "Morning Run"
-            assert workout.workout_token == "token_1"
-            assert workout.minutes == 45
+        assert [workout.id for workout in workouts] == [1, 2, 3]
+        assert len(httpx_mock.get_requests()) == 2
 
-    @pytest.mark.asyncio
-    async def test_list_routes(
+    async def test_list_all_workouts_without_total(
         self,
-        wahoo_config,
-        mock_routes_response,
-        temp_token_file,
-        monkeypatch,
+        api_client,
+        mock_workouts_response,
         httpx_mock,
     ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
+        third_workout = {**mock_workouts_response["workouts"][0], "id": 3}
 
-        # Mock the API response
+        # No total reported, so pages are walked until a short one comes back
         httpx_mock.add_response(
             method="GET",
-            url="https://api.wahooligan.com/v1/routes",
-            json=mock_routes_response,
+            url=f"{API_URL}/v1/workouts?page=1&per_page=2",
+            json=mock_workouts_response,
             status_code=200,
         )
-
-        async with WahooAPIClient(wahoo_config) as client:
-            routes = await client.list_routes()
-
-            assert len(routes) == 1
-            assert routes[0].name == "Mountain Loop"
-            assert routes[0].id == 1
-            assert routes[0].distance == 25.5
-
-    @pytest.mark.asyncio
-    async def test_get_route(
-        self, wahoo_config, mock_route_detail, temp_token_file, monkeypatch, httpx_mock
-    ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
-
-        # Mock the API response
         httpx_mock.add_response(
             method="GET",
-            url="https://api.wahooligan.com/v1/routes/1",
-            json=mock_route_detail,
+            url=f"{API_URL}/v1/workouts?page=2&per_page=2",
+            json={"workouts": [third_workout]},
             status_code=200,
         )
 
-        async with WahooAPIClient(wahoo_config) as client:
-            route = await client.get_route(1)
+        workouts = await api_client.list_all_workouts(per_page=2)
 
-            assert route.id == 1
-            assert route.name == "Mountain Loop"
-            assert route.file.url == "https://example.com/route1.fit"
+        assert [workout.id for workout in workouts] == [1, 2, 3]
+        assert len(httpx_mock.get_requests()) == 2
 
-    @pytest.mark.asyncio
-    async def test_list_plans(
+    async def test_get_workouts(
         self,
-        wahoo_config,
-        mock_plans_response,
-        temp_token_file,
-        monkeypatch,
+        api_client,
+        mock_workout_detail,
         httpx_mock,
     ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
-
-        # Mock the API response
-        httpx_mock.add_response(
-            method="GET",
-            url="https://api.wahooligan.com/v1/plans",
-            json=mock_plans_response,
-            status_code=200,
-        )
+        # Mock the API responses
+        for workout_id in (1, 2):
+            httpx_mock.add_response(
+                method="GET",
+                url=f"{API_URL}/v1/workouts/{workout_id}",
+                json={**mock_workout_detail, "id": workout_id},
+                status_code=200,
+            )
 
-        async with WahooAPIClient(wahoo_config) as client:
-            plans = await client.list_plans()
+        workouts = await api_client.get_workouts([1, 2, 1])
 
-            assert len(plans) == 1
-            assert plans[0].name == "Training Plan A"
-            assert plans[0].id == 1
-            assert not plans[0].deleted
+        # Repeated IDs are fetched only once but keep their position
+        assert [workout.id for workout in workouts] == [1, 2, 1]
+        assert len(httpx_mock.get_requests()) == 2
 
-    @pytest.mark.asyncio
-    async def test_get_plan(
-        self, wahoo_config, mock_plan_detail, temp_token_file, monkeypatch, httpx_mock
+    async def test_get_workouts_partial_failure(
+        self,
+        api_client,
+        mock_workout_detail,
+        httpx_mock,
     ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
-
-        # Mock the API response
         httpx_mock.add_response(
             method="GET",
-            url="https://api.wahooligan.com/v1/plans/1",
-            json=mock_plan_detail,
+            url=f"{API_URL}/v1/workouts/1",
+            json=mock_workout_detail,
             status_code=200,
         )
+        httpx_mock.add_response(
+            method="GET",
+            url=f"{API_URL}/v1/workouts/404",
+            status_code=404,
+        )
 
-        async with WahooAPIClient(wahoo_config) as client:
-            plan = await client.get_plan(1)
-
-            assert plan.id == 1
-            assert plan.name == "Training Plan A"
-            assert plan.file.url == "https://example.com/plan1.json"
+        found, missing = await api_client.get_workouts([1, 404])
 
-    @pytest.mark.asyncio
-    async def test_create_plan(
-        self, wahoo_config, temp_token_file, monkeypatch, httpx_mock
-    ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
+        # The bad ID comes back as its error without discarding the other
+        assert found.id == 1
+        assert isinstance(missing, httpx.HTTPStatusError)
+        assert missing.response.status_code == 404
 
+    async def test_create_plan(self, api_client, httpx_mock):
         # Mock response for plan creation
         mock_create_response = {
             "id": 100,
@@ -409,7 +504,7 @@ class TestWahooAPIClient:
         # Mock the POST request to /v1/plans
         httpx_mock.add_response(
             method="POST",
-            url="https://api.wahooligan.com/v1/plans",
+            url=f"{API_URL}/v1/plans",
             json=mock_create_response,
             status_code=201,
         )
@@ -443,85 +538,32 @@ class TestWahooAPIClient:
             provider_updated_at="2024-01-01T12:00:00Z",
         )
 
-        async with WahooAPIClient(wahoo_config) as client:
-            created_plan = await client.create_plan(plan_request)
-
-            assert created_plan.id == 100
-            assert created_plan.name == "New Training Plan"
-            assert created_plan.external_id == "EXT123"
-            assert created_plan.file.url == "https://example.com/new_plan.json"
-
-            # Verify the request was made to the correct endpoint
-            assert len(httpx_mock.get_requests()) == 1
-            request = httpx_mock.get_requests()[0]
-            assert request.method == "POST"
-            assert "/v1/plans" in str(request.url)
-
-    @pytest.mark.asyncio
-    async def test_list_power_zones(
-        self,
-        wahoo_config,
-        mock_power_zones_response,
-        temp_token_file,
-        monkeypatch,
-        httpx_mock,
-    ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
+        created_plan = await api_client.create_plan(plan_request)
 
-        # Mock the API response
-        httpx_mock.add_response(
-            method="GET",
-            url="https://api.wahooligan.com/v1/power_zones",
-            json=mock_power_zones_response,
-            status_code=200,
-        )
+        assert created_plan.id == 100
+        assert created_plan.name == "New Training Plan"
+        assert created_plan.external_id == "EXT123"
+        assert created_plan.file.url == "https://example.com/new_plan.json"
 
-        async with WahooAPIClient(wahoo_config) as client:
-            power_zones = await client.list_power_zones()
-
-            assert len(power_zones) == 1
-            assert power_zones[0].ftp == 250
-            assert power_zones[0].id == 1
-            assert power_zones[0].zone_7 == 400
-
-    @pytest.mark.asyncio
-    async def test_get_power_zone(
-        self,
-        wahoo_config,
-        mock_power_zone_detail,
-        temp_token_file,
-        monkeypatch,
-        httpx_mock,
-    ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
-
-        # Mock the API response
-        httpx_mock.add_response(
-            method="GET",
-            url="https://api.wahooligan.com/v1/power_zones/1",
-            json=mock_power_zone_detail,
-            status_code=200,
-        )
-
-        async with WahooAPIClient(wahoo_config) as client:
-            power_zone = await client.get_power_zone(1)
-
-            assert power_zone.id == 1
-            assert power_zone.ftp == 250
-            assert power_zone.critical_power == 275
+        # Verify the request was made to the correct endpoint
+        assert len(httpx_mock.get_requests()) == 1
+        request = httpx_mock.get_requests()[0]
+        assert request.method == "POST"
+        assert "/v1/plans" in str(request.url)
 
 
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.usefixtures("token_store")
 class TestMCPTools:
-    @pytest.mark.asyncio
     async def test_list_tools(self):
         # The list_tools decorator creates a handler, we need to call it directly
         tools = await list_tools()
-        assert len(tools) == 9
+        assert len(tools) == 10
 
-        tool_names = [tool.name for tool in tools]
-        expected_tools = [
+        assert {tool.name for tool in tools} == {
             "list_workouts",
             "get_workout",
+            "get_workouts",
             "list_routes",
             "get_route",
             "list_plans",
@@ -529,174 +571,211 @@ class TestMCPTools:
             "create_plan",
             "list_power_zones",
             "get_power_zone",
-        ]
+        }
 
-        for expected_tool in expected_tools:
-            assert expected_tool in tool_names
+    async def test_call_tool_list_workouts(self, workout_objects, monkeypatch):
+        monkeypatch.setattr(
+            WahooAPIClient, "list_workouts", async_return(workout_objects)
+        )
+        result = await call_tool("list_workouts", {})
 
-    @pytest.mark.asyncio
-    async def test_call_tool_list_workouts(
-        self, mock_workouts_response, temp_token_file, monkeypatch
-    ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
-        with patch(
-            "src.server.WahooAPIClient.list_workouts", new_callable=AsyncMock
-        ) as mock_list:
-            # Convert mock data to Workout objects
-            workout_objects = [Workout(**w) for w in mock_workouts_response["workouts"]]
-            mock_list.return_value = workout_objects
+        assert len(result) == 1
+        assert "Found 2 workouts" in result[0].text
+        assert "Morning Run" in result[0].text
+        assert "Evening Ride" in result[0].text
 
-            result = await call_tool("list_workouts", {})
+    async def test_call_tool_get_workout(self, workout_object, monkeypatch):
+        monkeypatch.setattr(WahooAPIClient, "get_workout", async_return(workout_object))
+        result = await call_tool("get_workout", {"workout_id": 1})
 
-            assert len(result) == 1
-            assert "Found 2 workouts" in result[0].text
-            assert "Morning Run" in result[0].text
-            assert "Evening Ride" in result[0].text
+        assert len(result) == 1
+        assert "Workout Details (ID: 1)" in result[0].text
+        assert "Morning Run" in result[0].text
+        assert "45 minutes" in result[0].text
+        assert "Full JSON" not in result[0].text
+
+        result = await call_tool("get_workout", {"workout_id": 1, "verbose": True})
 
-    @pytest.mark.asyncio
-    async def test_call_tool_get_workout(
-        self, mock_workout_detail, temp_token_file, monkeypatch
+        assert "Full JSON" in result[0].text
+        assert '"workout_token": "token_1"' in result[0].text
+
+    async def test_call_tool_get_workouts_partial_failure(
+        self, mock_workout_detail, token_store, httpx_mock
     ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
-        with patch(
-            "src.server.WahooAPIClient.get_workout", new_callable=AsyncMock
-        ) as mock_get:
-            # Convert mock data to Workout object
-            workout_object = Workout(**mock_workout_detail)
-            mock_get.return_value = workout_object
+        httpx_mock.add_response(
+            method="GET",
+            url=f"{API_URL}/v1/workouts/1",
+            json=mock_workout_detail,
+            status_code=200,
+        )
+        httpx_mock.add_response(
+            method="GET",
+            url=f"{API_URL}/v1/workouts/404",
+            status_code=404,
+        )
 
-            result = await call_tool("get_workout", {"workout_id": 1})
+        result = await call_tool("get_workouts", {"workout_ids": [1, 404]})
 
-            assert len(result) == 1
-            assert "Workout Details (ID: 1)" in result[0].text
-            assert "Morning Run" in result[0].text
-            assert "45 minutes" in result[0].text
+        assert len(result) == 1
+        assert "Morning Run" in result[0].text
+        assert "Workout 404: HTTP Error 404 Not Found" in result[0].text
 
-    @pytest.mark.asyncio
     async def test_call_tool_no_token(self, monkeypatch):
-        monkeypatch.delenv("WAHOO_TOKEN_FILE", raising=False)
+        monkeypatch.setattr(server, "TOKEN_FILE", None)
         result = await call_tool("list_workouts", {})
 
         assert len(result) == 1
         assert "WAHOO_TOKEN_FILE environment variable is required" in result[0].text
+        assert server._client is None
 
-    @pytest.mark.asyncio
-    async def test_call_tool_unknown_tool(self, temp_token_file, monkeypatch):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
+    async def test_call_tool_unknown_tool(self):
         result = await call_tool("unknown_tool", {})
 
         assert len(result) == 1
         assert "Unknown tool: unknown_tool" in result[0].text
+        # Rejected before the shared client and its connection pool are built
+        assert server._client is None
+
+    async def test_call_tool_http_error_truncates_body(self, monkeypatch):
+        request = httpx.Request("GET", f"{API_URL}/v1/workouts")
+        response = httpx.Response(500, text="x" * 10_000, request=request)
+        error = httpx.HTTPStatusError(
+            "Server error", request=request, response=response
+        )
+        monkeypatch.setattr(WahooAPIClient, "list_workouts", async_raise(error))
+        result = await call_tool("list_workouts", {})
+
+        assert len(result) == 1
+        assert result[0].text.startswith("HTTP Error 500 Internal Server Error")
+        assert len(result[0].text) < 600
+
+    async def test_call_tool_rate_limited(self, monkeypatch):
+        request = httpx.Request("GET", f"{API_URL}/v1/workouts")
+        response = httpx.Response(
+            429, headers={"Retry-After": "30"}, text="slow down", request=request
+        )
+        error = httpx.HTTPStatusError(
+            "Too many requests", request=request, response=response
+        )
+        monkeypatch.setattr(WahooAPIClient, "list_workouts", async_raise(error))
+        result = await call_tool("list_workouts", {})
+
+        assert len(result) == 1
+        assert "HTTP Error 429" in result[0].text
+        assert "retry after 30 seconds" in result[0].text
 
 
+@pytest.mark.asyncio(loop_scope="module")
 class TestRefreshToken:
     @pytest.fixture
-    def mock_token_store(self):
-        store = MagicMock(spec=TokenStore)
-        store.get_current.return_value = TokenData(
-            access_token="test_access",
-            refresh_token="test_refresh",
-            code_verifier="test_verifier",
-            expires_at=time.time() + 3600,
-        )
-        return store
+    def patched_refresh(self, monkeypatch):
+        mock_refresh = AsyncMock()
+        monkeypatch.setattr(WahooAPIClient, "_refresh_access_token", mock_refresh)
+        return mock_refresh
 
-    @pytest.mark.asyncio
     async def test_refresh_token_on_expired(
-        self, wahoo_config, temp_token_file, monkeypatch
+        self, wahoo_config, token_store, patched_refresh
     ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
-
-        # Modify the token file to have an expired token
-        with open(temp_token_file) as f:
-            token_data = json.load(f)
-        token_data["expires_at"] = time.time() - 100
-        with open(temp_token_file, "w") as f:
-            json.dump(token_data, f)
-
+        # Expire the stored token before the client loads it
+        token_store.get_current().expires_at = _NOW - 100
+        patched_refresh.return_value = True
         async with WahooAPIClient(wahoo_config) as client:
-            with patch.object(
-                client, "_refresh_access_token", new_callable=AsyncMock
-            ) as mock_refresh:
-                mock_refresh.return_value = True
-
-                # Ensure token refresh is called
-                await client._ensure_valid_token()
+            # Ensure token refresh is called
+            await client._ensure_valid_token()
 
-                mock_refresh.assert_called_once()
+            patched_refresh.assert_called_once()
 
-    @pytest.mark.asyncio
+    @pytest.mark.parametrize("refresh_ok", [True, False])
     async def test_refresh_token_on_401_response(
-        self, wahoo_config, temp_token_file, monkeypatch
+        self, refresh_ok, api_client, patched_refresh, httpx_mock
     ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
-        async with WahooAPIClient(wahoo_config) as client:
-            with patch.object(client.client, "get") as mock_get:
-                # First call returns 401, second call succeeds
-                mock_response_401 = MagicMock()
-                mock_response_401.status_code = 401
-
-                mock_response_200 = MagicMock()
-                mock_response_200.status_code = 200
-                mock_response_200.json.return_value = {"workouts": []}
-                mock_response_200.raise_for_status.return_value = None
-
-                mock_get.side_effect = [mock_response_401, mock_response_200]
-
-                with patch.object(
-                    client, "_refresh_access_token", new_callable=AsyncMock
-                ) as mock_refresh:
-                    mock_refresh.return_value = True
-
-                    workouts = await client.list_workouts()
-
-                    assert workouts == []
-                    mock_refresh.assert_called_once()
-                    assert mock_get.call_count == 2
-
-    @pytest.mark.asyncio
-    async def test_refresh_token_failure_raises_error(
-        self, wahoo_config, temp_token_file, monkeypatch
+        patched_refresh.return_value = refresh_ok
+        url = f"{API_URL}/v1/workouts?page=1&per_page=30"
+        httpx_mock.add_response(method="GET", url=url, status_code=401)
+
+        if refresh_ok:
+            # The retry after a successful refresh goes through
+            httpx_mock.add_response(method="GET", url=url, json={"workouts": []})
+            assert await api_client.list_workouts() == []
+        else:
+            with pytest.raises(Exception, match="Authentication failed"):
+                await api_client.list_workouts()
+
+        patched_refresh.assert_called_once()
+        assert len(httpx_mock.get_requests()) == (2 if refresh_ok else 1)
+
+    async def test_401_picks_up_token_file_written_elsewhere(
+        self, wahoo_config, monkeypatch, tmp_path, patched_refresh
     ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
-        async with WahooAPIClient(wahoo_config) as client:
-            with patch.object(client.client, "get") as mock_get:
-                mock_response_401 = MagicMock()
-                mock_response_401.status_code = 401
-                mock_response_401.request = MagicMock()
-                mock_get.return_value = mock_response_401
+        token_file = tmp_path / "tokens.json"
+        TokenStore(str(token_file)).save(
+            TokenData(access_token="old_token", refresh_token="old_refresh")
+        )
+        monkeypatch.setattr(server, "TOKEN_FILE", str(token_file))
+
+        def handle(request):
+            if request.headers["Authorization"] == "Bearer old_token":
+                return httpx.Response(401)
+            return httpx.Response(200, json={"workouts": []})
+
+        transport = httpx.MockTransport(handle)
+        async with httpx.AsyncClient(transport=transport) as http_client:
+            async with WahooAPIClient(wahoo_config, http_client=http_client) as client:
+                # Re-authenticate from another process while the client is open
+                TokenStore(str(token_file)).save(
+                    TokenData(access_token="new_token", refresh_token="new_refresh")
+                )
+                assert await client.list_workouts() == []
 
-                with patch.object(
-                    client, "_refresh_access_token", new_callable=AsyncMock
-                ) as mock_refresh:
-                    mock_refresh.return_value = False
+        # The rotated tokens are used as-is instead of spending the old ones
+        patched_refresh.assert_not_called()
+        assert client.token_data.refresh_token == "new_refresh"
 
-                    with pytest.raises(Exception) as exc_info:
-                        await client.list_workouts()
+    async def test_refresh_token_single_flight_under_burst(
+        self, wahoo_config, token_store, patched_refresh
+    ):
+        def handle(request):
+            if request.headers["Authorization"] == "Bearer test_token":
+                return httpx.Response(401)
+            return httpx.Response(200, json={"workouts": []})
+
+        async def refresh():
+            # Yield so the rest of the burst hits 401 while the refresh is in flight
+            await asyncio.sleep(0)
+            client.token_data = TokenData(access_token="new_access_token")
+            return True
+
+        patched_refresh.side_effect = refresh
+        transport = httpx.MockTransport(handle)
+        async with httpx.AsyncClient(transport=transport) as http_client:
+            async with WahooAPIClient(wahoo_config, http_client=http_client) as client:
+                results = await asyncio.gather(
+                    *(client.list_workouts() for _ in range(50))
+                )
 
-                    assert "Authentication failed" in str(exc_info.value)
+        assert results == [[]] * 50
+        patched_refresh.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_refresh_access_token_success(
-        self, wahoo_config, temp_token_file, monkeypatch
+        self, wahoo_config, token_store, monkeypatch
     ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", temp_token_file)
-        monkeypatch.setenv("WAHOO_CLIENT_ID", "test_client_id")
-        async with WahooAPIClient(wahoo_config) as client:
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_response = MagicMock()
-                mock_response.status_code = 200
-                mock_response.json.return_value = {
+        monkeypatch.setattr(server, "CLIENT_ID", "test_client_id")
+        requests = []
+
+        def handle(request):
+            requests.append(request)
+            return httpx.Response(
+                200,
+                json={
                     "access_token": "new_access_token",
                     "refresh_token": "new_refresh_token",
                     "expires_in": 7200,
-                }
-
-                mock_client = AsyncMock()
-                mock_client.post.return_value = mock_response
-                mock_client.__aenter__.return_value = mock_client
-                mock_client_class.return_value = mock_client
+                },
+            )
 
+        transport = httpx.MockTransport(handle)
+        async with httpx.AsyncClient(transport=transport) as http_client:
+            async with WahooAPIClient(wahoo_config, http_client=http_client) as client:
                 result = await client._refresh_access_token()
 
                 assert result is True
@@ -704,8 +783,17 @@ class TestRefreshToken:
                 assert (
                     client.token_store.get_current().access_token == "new_access_token"
                 )
+                # Refresh goes through the shared client without the old token
+                (request,) = requests
+                assert request.url == f"{API_URL}/oauth/token"
+                assert "Authorization" not in request.headers
+                form = parse_qs(request.content.decode())
+                assert form["grant_type"] == ["refresh_token"]
+                assert form["client_id"] == ["test_client_id"]
+                assert form["refresh_token"] == ["test_refresh_token"]
+                # The borrowed client never carries our bearer token
+                assert "Authorization" not in http_client.headers
 
-    @pytest.mark.asyncio
     async def test_refresh_access_token_no_refresh_token(
         self, wahoo_config, monkeypatch, tmp_path
     ):
@@ -713,198 +801,98 @@ class TestRefreshToken:
         token_file = tmp_path / "no_refresh_token.json"
         token_data = {
             "access_token": "test_token",
-            "expires_at": time.time() + 7200,
+            "expires_at": _NOW + 7200,
             "token_type": "Bearer",
         }
-        token_file.write_text(json.dumps(token_data))
+        token_file.write_bytes(orjson.dumps(token_data))
 
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", str(token_file))
+        monkeypatch.setattr(server, "TOKEN_FILE", str(token_file))
         async with WahooAPIClient(wahoo_config) as client:
             result = await client._refresh_access_token()
             assert result is False
 
-    @pytest.mark.asyncio
-    async def test_call_tool_with_token_store(
-        self, mock_workouts_response, monkeypatch
-    ):
-        monkeypatch.setenv("WAHOO_TOKEN_FILE", "/tmp/tokens.json")
+    async def test_call_tool_with_token_store(self, workout_objects, monkeypatch):
+        monkeypatch.setattr(server, "TOKEN_FILE", "tokens.json")
         mock_token_data = TokenData(
             access_token="stored_token",
             refresh_token="stored_refresh",
-            expires_at=time.time() + 3600,
+            expires_at=_NOW + 3600,
         )
 
-        with patch("src.server.TokenStore") as mock_store_class:
-            mock_store = MagicMock()
-            mock_store.load.return_value = mock_token_data
-            mock_store_class.return_value = mock_store
-
-            with patch(
-                "src.server.WahooAPIClient.list_workouts", new_callable=AsyncMock
-            ) as mock_list:
-                # Convert mock data to Workout objects
-                workout_objects = [
-                    Workout(**w) for w in mock_workouts_response["workouts"]
-                ]
-                mock_list.return_value = workout_objects
-
-                result = await call_tool("list_workouts", {})
+        monkeypatch.setattr(
+            WahooAPIClient, "list_workouts", async_return(workout_objects)
+        )
+        with patch(
+            "src.server.TokenStore",
+            return_value=InMemoryTokenStore(mock_token_data),
+        ) as mock_store_class:
+            result = await call_tool("list_workouts", {})
 
-                assert len(result) == 1
-                assert "Found 2 workouts" in result[0].text
+            assert len(result) == 1
+            assert "Found 2 workouts" in result[0].text
+            mock_store_class.assert_called_once_with("tokens.json")
+            assert server._client.token_data.access_token == "stored_token"
 
 
 class TestIntensityTypeMapping:
     """Test intensity type mapping for Wahoo API compatibility."""
 
-    def test_intensity_type_mapping(self):
+    @pytest.mark.parametrize(
+        ("interval_type", "expected"),
+        [
+            ("work", "active"),
+            ("warmup", "wu"),
+            ("cooldown", "cd"),
+            ("rest", "rest"),
+            # Mapping is case insensitive
+            ("WORK", "active"),
+            ("WarmUp", "wu"),
+            # Unknown types default to "active"
+            ("unknown_type", "active"),
+        ],
+    )
+    def test_intensity_type_mapping(self, interval_type, expected):
         """Test that interval types are correctly mapped to Wahoo intensity types."""
-        # Create test workout plan
-        plan = WorkoutPlan(
-            name="Test Plan",
-            intervals=[
-                WorkoutInterval(
-                    duration=300,
-                    targets=[WorkoutTarget(target_type="power", target_value=200)],
-                    interval_type="work",  # Should map to "active"
-                ),
-                WorkoutInterval(
-                    duration=300,
-                    targets=[WorkoutTarget(target_type="power", target_value=100)],
-                    interval_type="warmup",  # Should map to "wu"
-                ),
-                WorkoutInterval(
-                    duration=300,
-                    targets=[WorkoutTarget(target_type="power", target_value=150)],
-                    interval_type="cooldown",  # Should map to "cd"
-                ),
-                WorkoutInterval(
-                    duration=300,
-                    targets=[WorkoutTarget(target_type="power", target_value=120)],
-                    interval_type="rest",  # Should stay "rest"
-                ),
-            ],
-        )
-
-        # Convert to Wahoo format
-        wahoo_plan = plan.to_wahoo_format()
-
-        # Verify intensity types are correctly mapped
-        intervals = wahoo_plan["intervals"]
-        assert len(intervals) == 4
-
-        assert intervals[0]["intensity_type"] == "active"  # work -> active
-        assert intervals[1]["intensity_type"] == "wu"  # warmup -> wu
-        assert intervals[2]["intensity_type"] == "cd"  # cooldown -> cd
-        assert intervals[3]["intensity_type"] == "rest"  # rest -> rest
-
-    def test_intensity_type_case_insensitive(self):
-        """Test that intensity type mapping is case insensitive."""
-        plan = WorkoutPlan(
-            name="Test Plan",
-            intervals=[
-                WorkoutInterval(
-                    duration=300,
-                    targets=[WorkoutTarget(target_type="power", target_value=200)],
-                    interval_type="WORK",  # Should map to "active"
-                ),
-                WorkoutInterval(
-                    duration=300,
-                    targets=[WorkoutTarget(target_type="power", target_value=100)],
-                    interval_type="WarmUp",  # Should map to "wu"
-                ),
-            ],
-        )
-
-        wahoo_plan = plan.to_wahoo_format()
-        intervals = wahoo_plan["intervals"]
-
-        assert intervals[0]["intensity_type"] == "active"
-        assert intervals[1]["intensity_type"] == "wu"
-
-    def test_unknown_intensity_type_defaults_to_active(self):
-        """Test that unknown intensity types default to 'active'."""
         plan = WorkoutPlan(
             name="Test Plan",
             intervals=[
                 WorkoutInterval(
                     duration=300,
                     targets=[WorkoutTarget(target_type="power", target_value=200)],
-                    interval_type="unknown_type",  # Should default to "active"
+                    interval_type=interval_type,
                 ),
             ],
         )
 
-        wahoo_plan = plan.to_wahoo_format()
-        intervals = wahoo_plan["intervals"]
-
-        assert intervals[0]["intensity_type"] == "active"
-
-    def test_target_type_mapping(self):
+        intervals = plan.to_wahoo_format()["intervals"]
+
+        assert intervals[0]["intensity_type"] == expected
+
+    @pytest.mark.parametrize(
+        ("target_type", "expected"),
+        [
+            ("power", "watts"),
+            ("heart_rate", "hr"),
+            ("cadence", "rpm"),
+            # Mapping is case insensitive
+            ("POWER", "watts"),
+            # Unknown types default to "watts"
+            ("unknown_type", "watts"),
+        ],
+    )
+    def test_target_type_mapping(self, target_type, expected):
         """Test that target types are correctly mapped to Wahoo target types."""
         plan = WorkoutPlan(
             name="Test Plan",
             intervals=[
                 WorkoutInterval(
                     duration=300,
-                    targets=[
-                        WorkoutTarget(
-                            target_type="power", target_value=200
-                        ),  # Should map to "watts"
-                        WorkoutTarget(
-                            target_type="heart_rate", target_value=150
-                        ),  # Should map to "hr"
-                        WorkoutTarget(
-                            target_type="cadence", target_value=90
-                        ),  # Should map to "rpm"
-                    ],
-                    interval_type="work",
-                ),
-            ],
-        )
-
-        wahoo_plan = plan.to_wahoo_format()
-        targets = wahoo_plan["intervals"][0]["targets"]
-
-        assert len(targets) == 3
-        assert targets[0]["type"] == "watts"  # power -> watts
-        assert targets[1]["type"] == "hr"  # heart_rate -> hr
-        assert targets[2]["type"] == "rpm"  # cadence -> rpm
-
-    def test_target_type_case_insensitive(self):
-        """Test that target type mapping is case insensitive."""
-        plan = WorkoutPlan(
-            name="Test Plan",
-            intervals=[
-                WorkoutInterval(
-                    duration=300,
-                    targets=[WorkoutTarget(target_type="POWER", target_value=200)],
-                    interval_type="work",
-                ),
-            ],
-        )
-
-        wahoo_plan = plan.to_wahoo_format()
-        targets = wahoo_plan["intervals"][0]["targets"]
-
-        assert targets[0]["type"] == "watts"
-
-    def test_unknown_target_type_defaults_to_watts(self):
-        """Test that unknown target types default to 'watts'."""
-        plan = WorkoutPlan(
-            name="Test Plan",
-            intervals=[
-                WorkoutInterval(
-                    duration=300,
-                    targets=[
-                        WorkoutTarget(target_type="unknown_type", target_value=200)
-                    ],
+                    targets=[WorkoutTarget(target_type=target_type, target_value=200)],
                     interval_type="work",
                 ),
             ],
         )
 
-        wahoo_plan = plan.to_wahoo_format()
-        targets = wahoo_plan["intervals"][0]["targets"]
+        targets = plan.to_wahoo_format()["intervals"][0]["targets"]
 
-        assert targets[0]["type"] == "watts"
+        assert targets[0]["type"] == expected
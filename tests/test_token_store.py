@@ -1,8 +1,8 @@
-import json
 import os
 import time
 from unittest.mock import patch
 
+import orjson
 import pytest
 
 from src.token_store import TokenData, TokenStore
@@ -21,61 +21,51 @@ class TestTokenData:
         assert token.code_verifier == "test_verifier"
         assert token.token_type == "Bearer"
 
-    def test_is_expired_with_future_expiry(self):
-        token = TokenData(
-            access_token="test",
-            expires_at=time.time() + 3600,  # 1 hour from now
-        )
-        assert not token.is_expired()
-        assert not token.is_expired(buffer_seconds=300)
-
-    def test_is_expired_with_past_expiry(self):
-        token = TokenData(
-            access_token="test",
-            expires_at=time.time() - 100,  # 100 seconds ago
-        )
-        assert token.is_expired()
-        assert token.is_expired(buffer_seconds=0)
-
-    def test_is_expired_with_buffer(self):
-        token = TokenData(
-            access_token="test",
-            expires_at=time.time() + 200,  # 200 seconds from now
-        )
-        assert not token.is_expired(buffer_seconds=100)
-        assert token.is_expired(buffer_seconds=300)  # With 5-minute buffer
-
-    def test_is_expired_without_expiry(self):
-        token = TokenData(access_token="test")
-        assert not token.is_expired()
-        assert not token.is_expired(buffer_seconds=300)
-
-    def test_to_dict(self):
-        token = TokenData(
-            access_token="test_access",
-            refresh_token="test_refresh",
-            code_verifier="test_verifier",
-            expires_at=1234567890.0,
-        )
-        data = token.to_dict()
-        assert data == {
-            "access_token": "test_access",
-            "refresh_token": "test_refresh",
-            "code_verifier": "test_verifier",
-            "expires_at": 1234567890.0,
-            "token_type": "Bearer",
-        }
-
-    def test_to_dict_excludes_none(self):
-        token = TokenData(access_token="test_access")
-        data = token.to_dict()
-        assert data == {
-            "access_token": "test_access",
-            "token_type": "Bearer",
-        }
-        assert "refresh_token" not in data
-        assert "code_verifier" not in data
-        assert "expires_at" not in data
+    @pytest.mark.parametrize(
+        ("expires_in", "buffer_seconds", "expected"),
+        [
+            (3600, None, False),  # 1 hour from now
+            (3600, 300, False),
+            (-100, None, True),  # 100 seconds ago
+            (-100, 0, True),
+            (200, 100, False),
+            (200, 300, True),  # Inside a 5-minute buffer
+            (None, None, False),  # No expiry recorded
+            (None, 300, False),
+        ],
+    )
+    def test_is_expired(self, expires_in, buffer_seconds, expected):
+        expires_at = None if expires_in is None else time.time() + expires_in
+        token = TokenData(access_token="test", expires_at=expires_at)
+        if buffer_seconds is None:
+            assert token.is_expired() is expected
+        else:
+            assert token.is_expired(buffer_seconds=buffer_seconds) is expected
+
+    @pytest.mark.parametrize(
+        ("fields", "expected"),
+        [
+            (
+                {
+                    "refresh_token": "test_refresh",
+                    "code_verifier": "test_verifier",
+                    "expires_at": 1234567890.0,
+                },
+                {
+                    "access_token": "test_access",
+                    "refresh_token": "test_refresh",
+                    "code_verifier": "test_verifier",
+                    "expires_at": 1234567890.0,
+                    "token_type": "Bearer",
+                },
+            ),
+            # Unset optional fields are left out entirely
+            ({}, {"access_token": "test_access", "token_type": "Bearer"}),
+        ],
+    )
+    def test_to_dict(self, fields, expected):
+        token = TokenData(access_token="test_access", **fields)
+        assert token.to_dict() == expected
 
     def test_from_dict(self):
         data = {
@@ -138,8 +128,7 @@ class TestTokenStore:
             "refresh_token": "file_refresh_token",
             "expires_at": time.time() + 3600,
         }
-        with open(temp_token_file, "w") as f:
-            json.dump(token_data, f)
+        temp_token_file.write_bytes(orjson.dumps(token_data))
 
         store = TokenStore(str(temp_token_file))
         loaded_data = store.load()
@@ -149,6 +138,23 @@ class TestTokenStore:
         assert loaded_data.refresh_token == "file_refresh_token"
         assert loaded_data.expires_at == token_data["expires_at"]
 
+    def test_load_reuses_parsed_tokens_until_file_changes(self, temp_token_file):
+        TokenStore(str(temp_token_file)).save(TokenData(access_token="first"))
+        assert TokenStore(str(temp_token_file)).load().access_token == "first"
+
+        # Unchanged file: served from the cache without reading it again
+        with patch("pathlib.Path.read_bytes") as mock_read:
+            assert TokenStore(str(temp_token_file)).load().access_token == "first"
+            mock_read.assert_not_called()
+
+        # Another process replacing the file invalidates the cached entry, even
+        # with the same size and within the same mtime tick
+        other_file = temp_token_file.with_name("other.json")
+        other_file.write_bytes(orjson.dumps({"access_token": "fresh"}))
+        os.replace(other_file, temp_token_file)
+
+        assert TokenStore(str(temp_token_file)).load().access_token == "fresh"
+
     def test_load_from_invalid_json_file(self, temp_token_file):
         # Create an invalid JSON file
         with open(temp_token_file, "w") as f:
@@ -177,8 +183,7 @@ class TestTokenStore:
 
         # Verify file was created with correct content
         assert temp_token_file.exists()
-        with open(temp_token_file) as f:
-            saved_data = json.load(f)
+        saved_data = orjson.loads(temp_token_file.read_bytes())
 
         assert saved_data["access_token"] == "saved_access_token"
         assert saved_data["refresh_token"] == "saved_refresh_token"
@@ -189,6 +194,29 @@ class TestTokenStore:
             stat_info = os.stat(temp_token_file)
             assert stat_info.st_mode & 0o777 == 0o600
 
+        # The temp file used for the atomic write is renamed away
+        assert list(temp_token_file.parent.iterdir()) == [temp_token_file]
+
+    @pytest.mark.parametrize("existing", [True, False])
+    def test_save_is_atomic_under_crash(self, temp_token_file, monkeypatch, existing):
+        original = orjson.dumps({"access_token": "original_access_token"})
+        if existing:
+            temp_token_file.write_bytes(original)
+
+        def raising_replace(src, dst):
+            raise OSError("simulated crash before rename")
+
+        # Crash after the temp file is written but before it replaces the original
+        monkeypatch.setattr(os, "replace", raising_replace)
+        TokenStore(str(temp_token_file)).save(TokenData(access_token="new_token"))
+
+        if existing:
+            assert temp_token_file.read_bytes() == original
+        # Nothing else is left behind, including the half-written temp file
+        assert list(temp_token_file.parent.iterdir()) == (
+            [temp_token_file] if existing else []
+        )
+
     def test_save_creates_parent_directory(self, tmp_path):
         # Use a path with non-existent parent directory
         nested_path = tmp_path / "nested" / "dir" / "tokens.json"
@@ -209,14 +237,14 @@ class TestTokenStore:
             "token_type": "Bearer",
         }
 
-        before_time = time.time()
-        token_data = store.update_from_response(response_data)
-        after_time = time.time()
+        # Freeze the clock so the computed expiry is exact
+        with patch("src.token_store.time.time", return_value=1_705_320_000.0):
+            token_data = store.update_from_response(response_data)
 
         assert token_data.access_token == "new_access_token"
         assert token_data.refresh_token == "new_refresh_token"
         assert token_data.token_type == "Bearer"
-        assert before_time + 7200 <= token_data.expires_at <= after_time + 7200
+        assert token_data.expires_at == 1_705_320_000.0 + 7200
 
     def test_update_from_response_preserves_code_verifier(self, temp_token_file):
         store = TokenStore(str(temp_token_file))
@@ -262,8 +290,7 @@ class TestTokenStore:
 
     def test_clear(self, temp_token_file):
         # Create a token file
-        with open(temp_token_file, "w") as f:
-            json.dump({"access_token": "test"}, f)
+        temp_token_file.write_bytes(orjson.dumps({"access_token": "test"}))
 
         store = TokenStore(str(temp_token_file))
         store._token_data = TokenData(access_token="test")